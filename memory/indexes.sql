@@ -0,0 +1,12 @@
+-- Bring the Memories lookup indexes of an existing v2 database up to date.
+-- Idempotent; on-activate.sh runs it on every activation.
+
+CREATE INDEX IF NOT EXISTS idx_fixes_resource_scope ON fixes(resource, scope);
+CREATE INDEX IF NOT EXISTS idx_conventions_category_pattern ON conventions(category, pattern);
+CREATE INDEX IF NOT EXISTS idx_conventions_category_scope ON conventions(category, scope, confidence DESC);
+CREATE INDEX IF NOT EXISTS idx_quirks_service_region ON quirks(service, region, scope);
+
+-- Single-column indexes covered by the leading column of a composite above
+DROP INDEX IF EXISTS idx_fixes_resource;
+DROP INDEX IF EXISTS idx_conventions_category;
+DROP INDEX IF EXISTS idx_quirks_service;
@@ -9,5 +9,12 @@ ALTER TABLE quirks ADD COLUMN session_id TEXT REFERENCES sessions(session_id);
 CREATE INDEX IF NOT EXISTS idx_fixes_session ON fixes(session_id);
 CREATE INDEX IF NOT EXISTS idx_conventions_session ON conventions(session_id);
 CREATE INDEX IF NOT EXISTS idx_quirks_session ON quirks(session_id);
+CREATE INDEX IF NOT EXISTS idx_fixes_resource_scope ON fixes(resource, scope);
+CREATE INDEX IF NOT EXISTS idx_conventions_category_pattern ON conventions(category, pattern);
+CREATE INDEX IF NOT EXISTS idx_conventions_category_scope ON conventions(category, scope, confidence DESC);
+CREATE INDEX IF NOT EXISTS idx_quirks_service_region ON quirks(service, region, scope);
+DROP INDEX IF EXISTS idx_fixes_resource;
+DROP INDEX IF EXISTS idx_conventions_category;
+DROP INDEX IF EXISTS idx_quirks_service;
 
 UPDATE metadata SET value = '2', updated_at = strftime('%Y-%m-%dT%H:%M:%SZ','now') WHERE key = 'schema_version';
@@ -23,9 +23,9 @@ CREATE TABLE IF NOT EXISTS fixes (
 );
 
 CREATE INDEX IF NOT EXISTS idx_fixes_error_hash ON fixes(error_hash);
-CREATE INDEX IF NOT EXISTS idx_fixes_resource ON fixes(resource);
 CREATE INDEX IF NOT EXISTS idx_fixes_scope ON fixes(scope);
 CREATE INDEX IF NOT EXISTS idx_fixes_session ON fixes(session_id);
+CREATE INDEX IF NOT EXISTS idx_fixes_resource_scope ON fixes(resource, scope);
 
 -- Conventions: naming, structure, and tagging rules learned from corrections
 CREATE TABLE IF NOT EXISTS conventions (
@@ -42,9 +42,10 @@ CREATE TABLE IF NOT EXISTS conventions (
     distinct_sessions INTEGER NOT NULL DEFAULT 1  -- Number of distinct sessions confirming this
 );
 
-CREATE INDEX IF NOT EXISTS idx_conventions_category ON conventions(category);
 CREATE INDEX IF NOT EXISTS idx_conventions_scope ON conventions(scope);
 CREATE INDEX IF NOT EXISTS idx_conventions_session ON conventions(session_id);
+CREATE INDEX IF NOT EXISTS idx_conventions_category_pattern ON conventions(category, pattern);
+CREATE INDEX IF NOT EXISTS idx_conventions_category_scope ON conventions(category, scope, confidence DESC);
 
 -- Infrastructure quirks: local/team-specific AWS or Terraform gotchas
 CREATE TABLE IF NOT EXISTS quirks (
@@ -59,9 +60,9 @@ CREATE TABLE IF NOT EXISTS quirks (
     session_id  TEXT REFERENCES sessions(session_id) -- Session that created this entry
 );
 
-CREATE INDEX IF NOT EXISTS idx_quirks_service ON quirks(service);
 CREATE INDEX IF NOT EXISTS idx_quirks_scope ON quirks(scope);
 CREATE INDEX IF NOT EXISTS idx_quirks_session ON quirks(session_id);
+CREATE INDEX IF NOT EXISTS idx_quirks_service_region ON quirks(service, region, scope);
 
 -- Session log: tracks what the agent did across sessions for continuity
 CREATE TABLE IF NOT EXISTS sessions (
@@ -6,50 +6,88 @@ Stdlib only — no pip dependencies.
 """
 from __future__ import annotations
 
+import base64
+import copy
+import functools
 import hashlib
+import http.client
 import json
 import os
 import re
 import sys
-import urllib.request
 import urllib.error
+import urllib.parse
+import urllib.request
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Mapping, Optional
 
 CANON_DIR = Path(os.environ["BOID_CANON_DIR"]) if os.environ.get("BOID_CANON_DIR") else Path(__file__).resolve().parent.parent / "canon"
 
 
 # ── JSON I/O ──────────────────────────────────────────────────────────
 
+# Parsed Canon files keyed by path, invalidated when the file's mtime changes.
+_canon_cache: dict[Path, tuple[int, dict[str, Any]]] = {}
+
+
 def load_canon(filename: str) -> dict[str, Any]:
-    """Load a Canon JSON file and return the parsed dict."""
+    """Load a Canon JSON file and return the parsed dict.
+
+    Results are cached per process and re-read only when the file's mtime
+    changes. The returned dict is shared between callers — treat it as read-only
+    and use load_canon_for_write to get a copy that can be edited.
+    """
     path = CANON_DIR / filename
-    with open(path) as f:
-        return json.load(f)
+    mtime = path.stat().st_mtime_ns
+    cached = _canon_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    # Read through one descriptor and cache under its fstat mtime, so a write
+    # landing between the stat above and the read cannot pin stale contents
+    with path.open("rb") as f:
+        mtime = os.fstat(f.fileno()).st_mtime_ns
+        data = json.loads(f.read())
+    _canon_cache[path] = (mtime, data)
+    return data
+
+
+def load_canon_for_write(filename: str) -> dict[str, Any]:
+    """Load a Canon JSON file as a private deep copy that callers may mutate.
+
+    Edits to the copy never leak into load_canon's shared cache; persist
+    them with save_canon.
+    """
+    return copy.deepcopy(load_canon(filename))
 
 
 def save_canon(filename: str, data: dict[str, Any]) -> Path:
     """Save a Canon JSON file with consistent formatting."""
     path = CANON_DIR / filename
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    _canon_cache.pop(path, None)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
     return path
 
 
 def validate_canon(filename: str) -> list[str]:
-    """Validate a Canon JSON file, return list of errors (empty = valid)."""
-    errors: list[str] = []
-    path = CANON_DIR / filename
-    if not path.exists():
-        return [f"File not found: {path}"]
+    """Validate a Canon JSON file, return list of errors (empty = valid).
 
+    Shares load_canon's cached parse, so validating and then searching or
+    counting the same file parses it only once.
+    """
     try:
         data = load_canon(filename)
+    except FileNotFoundError:
+        return [f"File not found: {CANON_DIR / filename}"]
     except json.JSONDecodeError as e:
         return [f"Invalid JSON: {e}"]
 
+    return _validate_data(data)
+
+
+def _validate_data(data: dict[str, Any]) -> list[str]:
+    """Validate an already-parsed Canon dict, return list of errors."""
+    errors: list[str] = []
     if "_meta" not in data:
         errors.append("Missing _meta field")
     else:
@@ -91,14 +129,12 @@ def update_meta(data: dict[str, Any], **overrides: str) -> dict[str, Any]:
 
 def dedup_by_field(entries: list[dict], field: str) -> list[dict]:
     """Remove duplicate entries based on a specific field value."""
-    seen: set[str] = set()
-    result: list[dict] = []
+    seen: dict[str, dict] = {}
     for entry in entries:
         key = entry.get(field, "")
         if key and key not in seen:
-            seen.add(key)
-            result.append(entry)
-    return result
+            seen[key] = entry
+    return list(seen.values())
 
 
 def entry_hash(entry: dict, fields: list[str]) -> str:
@@ -109,16 +145,111 @@ def entry_hash(entry: dict, fields: list[str]) -> str:
 
 # ── Fetch helpers ─────────────────────────────────────────────────────
 
-def fetch_url(url: str, timeout: int = 30) -> str:
-    """Fetch a URL and return the response body as text."""
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "terraform-aws-boid/0.1 (Canon seeder)"},
+_USER_AGENT = "terraform-aws-boid/0.1 (Canon seeder)"
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# Keep-alive connections keyed by (scheme, host, port), reused across fetch_url calls.
+_connections: dict[tuple[str, str, Optional[int]], http.client.HTTPConnection] = {}
+
+
+def _get_connection(key: tuple[str, str, Optional[int]], timeout: int) -> http.client.HTTPConnection:
+    """Return a pooled connection for (scheme, host, port), creating it on first use."""
+    conn = _connections.get(key)
+    if conn is None:
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(host, port, timeout=timeout)
+        _connections[key] = conn
+    else:
+        # Each call's timeout applies, not the one the connection was opened with
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_connection(key: tuple[str, str, Optional[int]]) -> None:
+    """Close and forget a pooled connection."""
+    conn = _connections.pop(key, None)
+    if conn is not None:
+        conn.close()
+
+
+def _uses_proxy(parts: urllib.parse.SplitResult) -> bool:
+    """Whether the environment routes this URL through a proxy (HTTP(S)_PROXY, NO_PROXY)."""
+    return parts.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(
+        parts.hostname or ""
     )
+
+
+def _urlopen_get(url: str, timeout: int) -> bytes:
+    """GET a URL with urllib, which honors HTTP(S)_PROXY."""
+    req = urllib.request.Request(url, headers={"User-Agent": _USER_AGENT})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
+
+
+def _http_get(url: str, timeout: int, redirects: int = 5) -> bytes:
+    """GET a URL over a pooled connection, following redirects.
+
+    A connection the server has already closed is retried once on a fresh one.
+    Proxied URLs go through urlopen instead; credentials in the URL are sent
+    as Basic auth rather than treated as part of the host.
+    Raises urllib.error.HTTPError for 4xx/5xx responses and when a redirect
+    chain exceeds the limit.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise urllib.error.URLError(f"unsupported URL scheme: {parts.scheme!r}")
+    if _uses_proxy(parts):
+        return _urlopen_get(url, timeout)
+    key = (parts.scheme, parts.hostname or "", parts.port)
+    headers = {"User-Agent": _USER_AGENT}
+    if parts.username is not None:
+        userinfo = urllib.parse.unquote(parts.username) + ":" + urllib.parse.unquote(parts.password or "")
+        headers["Authorization"] = "Basic " + base64.b64encode(userinfo.encode()).decode("ascii")
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    for attempt in (0, 1):
+        conn = _get_connection(key, timeout)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+            break
+        except ConnectionError:
+            _drop_connection(key)
+            if attempt:
+                raise
+        except (OSError, http.client.HTTPException):
+            _drop_connection(key)
+            raise
+
+    if resp.will_close:
+        _drop_connection(key)
+
+    location = resp.getheader("Location")
+    if resp.status in _REDIRECT_STATUSES and location:
+        if redirects <= 0:
+            raise urllib.error.HTTPError(
+                url, resp.status, "redirect limit exceeded", resp.headers, None,
+            )
+        return _http_get(urllib.parse.urljoin(url, location), timeout, redirects - 1)
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+    return body
+
+
+def fetch_url(url: str, timeout: int = 30) -> str:
+    """Fetch a URL and return the response body as text.
+
+    Connections are kept alive and reused for later fetches from the same host.
+    """
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return resp.read().decode("utf-8", errors="replace")
-    except urllib.error.URLError as e:
+        return _http_get(url, timeout).decode("utf-8", errors="replace")
+    except (OSError, http.client.HTTPException) as e:
         print(f"  WARN: Failed to fetch {url}: {e}", file=sys.stderr)
         return ""
 
@@ -137,10 +268,64 @@ def fetch_json(url: str, timeout: int = 30) -> Any:
 
 # ── Validation helpers ────────────────────────────────────────────────
 
+def _pattern_flags(pattern: str) -> re.RegexFlag:
+    """Case-insensitive; ASCII-only classes and case folding for ASCII patterns.
+
+    Terraform diagnostics are ASCII, and re.ASCII spares the engine Unicode
+    table lookups on every character of long diagnostic details.
+    """
+    return re.IGNORECASE | re.ASCII if pattern.isascii() else re.IGNORECASE
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(pattern: str) -> re.Pattern[str]:
+    """Compile a Canon error pattern, cached by pattern string."""
+    return re.compile(pattern, _pattern_flags(pattern))
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_signature(pattern: str) -> tuple[re.Pattern[str] | None, str]:
+    """Return (compiled regex or None if invalid, lowercased pattern) for matching."""
+    try:
+        return _compile(pattern), pattern.lower()
+    except re.error:
+        return None, pattern.lower()
+
+
+def _union_safe(pattern: str) -> bool:
+    """Whether a pattern can join the combined prefilter.
+
+    Patterns with capture groups are left out: inside the alternation their
+    groups are renumbered, so a backreference would point at another
+    pattern's group and the prefilter could miss a real match.
+    """
+    compiled = _compile_signature(pattern)[0]
+    return compiled is not None and compiled.groups == 0
+
+
+@functools.lru_cache(maxsize=32)
+def _combined_pattern(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Compile union-safe patterns into one alternation for a single-pass prefilter.
+
+    Returns None if there are no union-safe patterns, if they mix ASCII and
+    non-ASCII (the union could not use the same flags as every pattern), or
+    if the union fails to compile (e.g. patterns that use global inline flags).
+    Patterns left out of the union must be searched on their own.
+    """
+    valid = [p for p in patterns if _union_safe(p)]
+    if not valid or len({p.isascii() for p in valid}) > 1:
+        return None
+    union = "|".join(f"(?:{p})" for p in valid)
+    try:
+        return re.compile(union, _pattern_flags(union))
+    except re.error:
+        return None
+
+
 def validate_regex(pattern: str) -> bool:
     """Check if a string is a valid regex."""
     try:
-        re.compile(pattern)
+        _compile(pattern)
         return True
     except re.error:
         return False
@@ -148,7 +333,11 @@ def validate_regex(pattern: str) -> bool:
 
 def count_entries(filename: str) -> dict[str, int]:
     """Count entries in each array in a Canon file."""
-    data = load_canon(filename)
+    return _count_data(load_canon(filename))
+
+
+def _count_data(data: dict[str, Any]) -> dict[str, int]:
+    """Count entries in each array of an already-parsed Canon dict."""
     counts: dict[str, int] = {}
     for key, value in data.items():
         if key != "_meta" and isinstance(value, list):
@@ -158,56 +347,171 @@ def count_entries(filename: str) -> dict[str, int]:
 
 # ── Search / Retrieval ────────────────────────────────────────────────
 
+_CompiledSignatures = tuple[
+    Optional[re.Pattern[str]],
+    tuple[tuple[Optional[re.Pattern[str]], bool, str], ...],
+]
+
+
+@functools.lru_cache(maxsize=64)
+def _compiled_signatures(patterns: tuple[str, ...]) -> _CompiledSignatures:
+    """Return (combined prefilter, ((compiled, gated, pattern_lower), ...)) for a pattern set.
+
+    Keyed by the patterns themselves, so an edited or reloaded signature list
+    gets fresh matchers. gated is True when the combined prefilter covers the
+    pattern, so a prefilter miss rules it out.
+    """
+    combined = _combined_pattern(patterns)
+    compiled = []
+    for p in patterns:
+        regex, pattern_lower = _compile_signature(p)
+        compiled.append((regex, combined is not None and _union_safe(p), pattern_lower))
+    return combined, tuple(compiled)
+
+
 def match_error(error_text: str, signatures: list[dict]) -> list[dict]:
     """Find matching Canon signatures for a given error text."""
+    patterns = tuple(sig.get("error_pattern", "") for sig in signatures)
+    combined, compiled_sigs = _compiled_signatures(patterns)
+
     matches = []
-    for sig in signatures:
-        pattern = sig.get("error_pattern", "")
-        try:
-            if re.search(pattern, error_text, re.IGNORECASE):
-                matches.append(sig)
-        except re.error:
-            if pattern.lower() in error_text.lower():
+    low = error_text.lower()
+    # One pass over the text rules out every regex signature when nothing matches.
+    # Alternation only reports the leftmost alternative, so hits are still
+    # attributed per signature below.
+    regex_hit = combined is None or combined.search(error_text) is not None
+    for (compiled, gated, pattern_lower), sig in zip(compiled_sigs, signatures):
+        if compiled is not None:
+            if (regex_hit or not gated) and compiled.search(error_text):
                 matches.append(sig)
+        elif pattern_lower in low:
+            matches.append(sig)
     return matches
 
 
+# Lowercased lookup structures derived from a loaded Canon file, keyed by
+# (filename, kind) and rebuilt whenever load_canon returns a new dict.
+_index_cache: dict[tuple[str, str], tuple[dict[str, Any], Any]] = {}
+
+
+def _canon_index(filename: str, kind: str, build: Callable[[dict[str, Any]], Any]) -> Any:
+    """Return the `kind` index for a Canon file, building it once per loaded dict."""
+    data = load_canon(filename)
+    key = (filename, kind)
+    cached = _index_cache.get(key)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    index = build(data)
+    _index_cache[key] = (data, index)
+    return index
+
+
+def _signature_resources(data: dict[str, Any]) -> list[tuple[str, dict]]:
+    """Pair each error signature with its lowercased 'resource' field."""
+    return [(sig.get("resource", "").lower(), sig) for sig in data.get("signatures", [])]
+
+
+def _sg_resources(data: dict[str, Any]) -> list[tuple[tuple[str, ...], dict]]:
+    """Pair each SG pattern with its lowercased 'terraform_resources'."""
+    return [
+        (tuple(res.lower() for res in pattern.get("terraform_resources", [])), pattern)
+        for pattern in data.get("patterns", [])
+    ]
+
+
+def _limits_by_service(data: dict[str, Any]) -> dict[str, list[dict]]:
+    """Group AWS limits by lowercased service name."""
+    index: dict[str, list[dict]] = {}
+    for limit in data.get("limits", []):
+        index.setdefault(limit.get("service", "").lower(), []).append(limit)
+    return index
+
+
+def limits_by_service() -> Mapping[str, list[dict]]:
+    """Return aws-limits.json entries grouped by lowercased service name.
+
+    Services appear in order of their first limit and each list is in file
+    order. Built once per loaded file and shared between callers — treat it
+    as read-only. Raises like load_canon if the file is missing or invalid.
+    """
+    return _canon_index("aws-limits.json", "service", _limits_by_service)
+
+
+def _tag_index(list_key: str, tag_field: str) -> Callable[[dict[str, Any]], dict[str, list[int]]]:
+    """Build a lowercased tag → entry positions index for one Canon list."""
+    def build(data: dict[str, Any]) -> dict[str, list[int]]:
+        index: dict[str, list[int]] = {}
+        for pos, entry in enumerate(data.get(list_key, [])):
+            for tag in {t.lower() for t in entry.get(tag_field, [])}:
+                index.setdefault(tag, []).append(pos)
+        return index
+    return build
+
+
+_RESOURCE_SOURCES = ("error-signatures.json", "sg-interactions.json", "aws-limits.json")
+
+# search_by_resource results per lowercased resource type. Valid only while the
+# Canon directory and source file mtimes match _resource_results_state.
+_resource_results: dict[str, list[dict]] = {}
+_resource_results_state: tuple = ()
+
+
+def _canon_state(filenames: tuple[str, ...]) -> tuple:
+    """Snapshot (dir, mtimes) for a set of Canon files; missing files record None."""
+    mtimes: list[int | None] = []
+    for filename in filenames:
+        try:
+            mtimes.append((CANON_DIR / filename).stat().st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return (CANON_DIR, *mtimes)
+
+
 def search_by_resource(resource_type: str) -> list[dict]:
     """Search error-signatures, sg-interactions, and aws-limits for entries matching a resource type.
 
     Returns a list of dicts, each with 'source' (filename) and 'entry' (the matched entry).
+    Results are memoized per resource type until one of the source files changes;
+    each call gets its own result dicts.
     """
-    results: list[dict] = []
+    global _resource_results_state
     rt = resource_type.lower()
+    state = _canon_state(_RESOURCE_SOURCES)
+    if state != _resource_results_state:
+        _resource_results.clear()
+        _resource_results_state = state
+    cached = _resource_results.get(rt)
+    if cached is None:
+        cached = _resource_results[rt] = _search_by_resource(rt)
+    return [dict(r) for r in cached]
+
+
+def _search_by_resource(rt: str) -> list[dict]:
+    """Uncached search_by_resource body; `rt` is already lowercased."""
+    results: list[dict] = []
 
     # error-signatures: match on 'resource' field
     try:
-        sigs = load_canon("error-signatures.json")
-        for sig in sigs.get("signatures", []):
-            if rt in sig.get("resource", "").lower():
+        for resource, sig in _canon_index("error-signatures.json", "resource", _signature_resources):
+            if rt in resource:
                 results.append({"source": "error-signatures.json", "entry": sig})
     except (FileNotFoundError, json.JSONDecodeError):
         pass
 
     # sg-interactions: match on 'terraform_resources' list
     try:
-        sg = load_canon("sg-interactions.json")
-        for pattern in sg.get("patterns", []):
-            for res in pattern.get("terraform_resources", []):
-                if rt in res.lower():
-                    results.append({"source": "sg-interactions.json", "entry": pattern})
-                    break
+        for resources, pattern in _canon_index("sg-interactions.json", "resource", _sg_resources):
+            if any(rt in res for res in resources):
+                results.append({"source": "sg-interactions.json", "entry": pattern})
     except (FileNotFoundError, json.JSONDecodeError):
         pass
 
     # aws-limits: match on 'service' field (strip aws_ prefix for comparison)
     try:
-        limits = load_canon("aws-limits.json")
         # aws_security_group → ec2, aws_s3_bucket → s3, etc.
         service_hint = rt.replace("aws_", "").split("_")[0]
-        for limit in limits.get("limits", []):
-            if service_hint == limit.get("service", "").lower():
-                results.append({"source": "aws-limits.json", "entry": limit})
+        for limit in limits_by_service().get(service_hint, []):
+            results.append({"source": "aws-limits.json", "entry": limit})
     except (FileNotFoundError, json.JSONDecodeError):
         pass
 
@@ -230,11 +534,13 @@ def search_by_tags(tags: list[str]) -> list[dict]:
 
     for filename, list_key, tag_field in search_targets:
         try:
-            data = load_canon(filename)
-            for entry in data.get(list_key, []):
-                entry_tags = {t.lower() for t in entry.get(tag_field, [])}
-                if tags_lower & entry_tags:
-                    results.append({"source": filename, "entry": entry})
+            index = _canon_index(filename, f"tags:{list_key}", _tag_index(list_key, tag_field))
+            entries = load_canon(filename).get(list_key, [])
+            positions: set[int] = set()
+            for tag in tags_lower:
+                positions.update(index.get(tag, ()))
+            for pos in sorted(positions):
+                results.append({"source": filename, "entry": entries[pos]})
         except (FileNotFoundError, json.JSONDecodeError):
             pass
 
@@ -250,11 +556,16 @@ def report_canon_status() -> None:
     print("=" * 50)
     for path in files:
         name = path.name
-        errors = validate_canon(name)
+        try:
+            data = load_canon(name)
+        except json.JSONDecodeError as e:
+            print(f"  ✗ {name}: Invalid JSON: {e}")
+            continue
+        errors = _validate_data(data)
         if errors:
             print(f"  ✗ {name}: {', '.join(errors)}")
         else:
-            counts = count_entries(name)
+            counts = _count_data(data)
             parts = [f"{k}={v}" for k, v in counts.items()]
             print(f"  ✓ {name}: {', '.join(parts) if parts else 'empty'}")
     print("=" * 50)
@@ -32,7 +32,7 @@ def search_error(error_text: str) -> list[dict]:
         return []
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         description="Search Canon knowledge base",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -54,7 +54,7 @@ def main() -> None:
         help="Search Canon for entries matching any of the given tags (comma-separated)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not any([args.error, args.resource, args.tags]):
         parser.print_help()
@@ -70,11 +70,11 @@ def main() -> None:
         tag_list = [t.strip() for t in args.tags.split(",") if t.strip()]
         results.extend(search_by_tags(tag_list))
 
-    # Deduplicate by entry content
-    seen: set[str] = set()
+    # Deduplicate by entry identity (load_canon shares parsed entries per process)
+    seen: set[tuple[str, int]] = set()
     unique: list[dict] = []
     for r in results:
-        key = json.dumps(r["entry"], sort_keys=True)
+        key = (r["source"], id(r["entry"]))
         if key not in seen:
             seen.add(key)
             unique.append(r)
@@ -6,12 +6,18 @@ Stdlib only — no pip dependencies. Mirrors canon_lib.py patterns.
 """
 from __future__ import annotations
 
+import functools
 import hashlib
 import os
 import re
 import sqlite3
+import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from canon_lib import load_canon, match_error
 
 # ── Confidence model constants ───────────────────────────────────────
 
@@ -29,6 +35,19 @@ SCHEMA_FILE = Path(os.environ["BOID_HOME"]) / "memory" / "schema.sql" if os.envi
 
 # ── Connection ───────────────────────────────────────────────────────
 
+# Applied on every connect(): WAL with NORMAL sync is durable across app crashes
+# and much cheaper per commit; busy_timeout lets concurrent sessions wait for
+# the write lock instead of failing with "database is locked".
+CONNECTION_PRAGMAS = (
+    "journal_mode = WAL",
+    "synchronous = NORMAL",
+    "busy_timeout = 5000",
+    "cache_size = -65536",       # 64 MiB page cache
+    "temp_store = MEMORY",
+    "mmap_size = 268435456",     # 256 MiB
+)
+
+
 def connect(db_path: Optional[str] = None) -> sqlite3.Connection:
     """Open a connection to the Memories SQLite database.
 
@@ -38,6 +57,8 @@ def connect(db_path: Optional[str] = None) -> sqlite3.Connection:
         db_path = os.environ.get("BOID_MEMORY_DB", "memory/boid.db")
     conn = sqlite3.connect(db_path)
     conn.execute("PRAGMA foreign_keys = ON")
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -47,13 +68,55 @@ def init_schema(conn: sqlite3.Connection) -> None:
     conn.executescript(SCHEMA_FILE.read_text())
 
 
+# Connections currently inside a batch(); their per-write commits are deferred.
+_batch_conns: set[sqlite3.Connection] = set()
+
+
+@contextmanager
+def batch(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Group many writes into one transaction with a single commit on exit.
+
+    Inside the block, record_*/reinforce/contradict skip their own commit.
+    Rolls back everything if the block raises. Nested batches join the outer one.
+
+        with batch(conn):
+            for row in rows:
+                record_fix(conn, **row)
+    """
+    if conn in _batch_conns:
+        yield conn
+        return
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    _batch_conns.add(conn)
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+    finally:
+        _batch_conns.discard(conn)
+
+
+def _commit(conn: sqlite3.Connection) -> None:
+    """Commit unless the connection is inside a batch()."""
+    if conn not in _batch_conns:
+        conn.commit()
+
+
 # ── Helpers ──────────────────────────────────────────────────────────
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def _normalize_error(error_text: str) -> str:
     """Normalize error text for hashing: lowercase, collapse whitespace."""
-    return re.sub(r"\s+", " ", error_text.strip().lower())
+    return _WHITESPACE_RE.sub(" ", error_text.strip().lower())
 
 
+@functools.lru_cache(maxsize=512)
 def _error_hash(error_text: str) -> str:
     """SHA-256 hex digest of normalized error text."""
     return hashlib.sha256(_normalize_error(error_text).encode()).hexdigest()
@@ -89,17 +152,16 @@ def record_fix(
     Otherwise inserts a new row.
     """
     eh = _error_hash(error_text)
-    cur = conn.execute("SELECT id, hit_count FROM fixes WHERE error_hash = ?", (eh,))
-    existing = cur.fetchone()
-
-    if existing:
-        row_id = existing["id"]
-        conn.execute(
-            "UPDATE fixes SET hit_count = ?, updated_at = ? WHERE id = ?",
-            (existing["hit_count"] + 1, _now(), row_id),
-        )
-        conn.commit()
-        return row_id
+    updated = conn.execute(
+        """UPDATE fixes SET hit_count = hit_count + 1, updated_at = ?
+           WHERE id = (SELECT id FROM fixes WHERE error_hash = ? ORDER BY id LIMIT 1)
+           RETURNING id""",
+        (_now(), eh),
+    ).fetchall()
+
+    if updated:
+        _commit(conn)
+        return updated[0]["id"]
 
     cur = conn.execute(
         """INSERT INTO fixes
@@ -109,7 +171,7 @@ def record_fix(
         (eh, error_text, root_cause, fix, resource, provider,
          validated, scope, session_id),
     )
-    conn.commit()
+    _commit(conn)
     return cur.lastrowid  # type: ignore[return-value]
 
 
@@ -128,26 +190,23 @@ def record_convention(
     updates distinct_sessions if session_id differs.
     Otherwise inserts a new row with confidence=CONFIDENCE_BASE.
     """
-    cur = conn.execute(
-        "SELECT id, confidence, session_id, distinct_sessions FROM conventions WHERE category = ? AND pattern = ?",
-        (category, pattern),
-    )
-    existing = cur.fetchone()
-
-    if existing:
-        row_id = existing["id"]
-        new_confidence = min(existing["confidence"] + CORRECTION_DELTA, CONFIDENCE_CAP)
-        new_distinct = existing["distinct_sessions"]
-        if session_id and session_id != existing["session_id"]:
-            new_distinct += 1
-        conn.execute(
-            """UPDATE conventions
-               SET confidence = ?, distinct_sessions = ?, session_id = ?, updated_at = ?
-               WHERE id = ?""",
-            (new_confidence, new_distinct, session_id, _now(), row_id),
-        )
-        conn.commit()
-        return row_id
+    updated = conn.execute(
+        """UPDATE conventions
+           SET confidence = MIN(confidence + :delta, :cap),
+               distinct_sessions = distinct_sessions + CASE
+                   WHEN :sid <> '' AND :sid IS NOT session_id THEN 1 ELSE 0 END,
+               session_id = :sid,
+               updated_at = :now
+           WHERE id = (SELECT id FROM conventions WHERE category = :category AND pattern = :pattern
+                       ORDER BY id LIMIT 1)
+           RETURNING id""",
+        {"delta": CORRECTION_DELTA, "cap": CONFIDENCE_CAP, "sid": session_id,
+         "now": _now(), "category": category, "pattern": pattern},
+    ).fetchall()
+
+    if updated:
+        _commit(conn)
+        return updated[0]["id"]
 
     cur = conn.execute(
         """INSERT INTO conventions
@@ -155,7 +214,7 @@ def record_convention(
            VALUES (?, ?, ?, ?, ?, ?, ?, 1)""",
         (category, pattern, example, source, scope, CONFIDENCE_BASE, session_id),
     )
-    conn.commit()
+    _commit(conn)
     return cur.lastrowid  # type: ignore[return-value]
 
 
@@ -175,7 +234,7 @@ def record_quirk(
            VALUES (?, ?, ?, ?, ?, ?)""",
         (service, description, region, workaround, scope, session_id),
     )
-    conn.commit()
+    _commit(conn)
     return cur.lastrowid  # type: ignore[return-value]
 
 
@@ -298,29 +357,24 @@ def reinforce_convention(
 
     If session_id is new for this convention, bumps distinct_sessions.
     """
-    row = conn.execute(
-        "SELECT confidence, session_id, distinct_sessions FROM conventions WHERE id = ?",
-        (convention_id,),
-    ).fetchone()
-    if row is None:
+    updated = conn.execute(
+        """UPDATE conventions
+           SET confidence = MIN(confidence + :delta, :cap),
+               distinct_sessions = distinct_sessions + CASE
+                   WHEN :sid <> '' AND :sid IS NOT session_id THEN 1 ELSE 0 END,
+               session_id = CASE
+                   WHEN :sid <> '' AND :sid IS NOT session_id THEN :sid ELSE session_id END,
+               updated_at = :now
+           WHERE id = :id
+           RETURNING confidence""",
+        {"delta": REINFORCE_DELTA, "cap": CONFIDENCE_CAP, "sid": session_id,
+         "now": _now(), "id": convention_id},
+    ).fetchall()
+    if not updated:
         raise ValueError(f"Convention {convention_id} not found")
 
-    new_confidence = min(row["confidence"] + REINFORCE_DELTA, CONFIDENCE_CAP)
-    new_distinct = row["distinct_sessions"]
-    update_session_id = row["session_id"]
-
-    if session_id and session_id != row["session_id"]:
-        new_distinct += 1
-        update_session_id = session_id
-
-    conn.execute(
-        """UPDATE conventions
-           SET confidence = ?, distinct_sessions = ?, session_id = ?, updated_at = ?
-           WHERE id = ?""",
-        (new_confidence, new_distinct, update_session_id, _now(), convention_id),
-    )
-    conn.commit()
-    return new_confidence
+    _commit(conn)
+    return updated[0]["confidence"]
 
 
 def contradict_convention(
@@ -335,7 +389,7 @@ def contradict_convention(
         "UPDATE conventions SET confidence = ?, updated_at = ? WHERE id = ?",
         (CONTRADICTION_RESET, _now(), convention_id),
     )
-    conn.commit()
+    _commit(conn)
     return CONTRADICTION_RESET
 
 
@@ -365,10 +419,6 @@ def query_with_priority(
     Ordering in merged: overriding Memory entries first, then Canon results,
     then non-overriding Memory entries.
     """
-    import sys
-    sys.path.insert(0, str(Path(__file__).resolve().parent))
-    from canon_lib import load_canon, match_error
-
     # Canon lookup
     canon_results: list[dict[str, Any]] = []
     try:
@@ -378,9 +428,7 @@ def query_with_priority(
         pass
 
     # Memory lookup
-    conn = connect(db_path)
-    memory_fixes = lookup_fix(conn, error_text=error_text)
-    conn.close()
+    memory_fixes = _lookup_memory_fixes(error_text, db_path)
 
     # Classify memory results
     overriding: list[dict[str, Any]] = []
@@ -419,6 +467,15 @@ def query_with_priority(
     }
 
 
+def _lookup_memory_fixes(error_text: str, db_path: Optional[str]) -> list[dict[str, Any]]:
+    """Open a connection, look up fixes for error_text, and close it."""
+    conn = connect(db_path)
+    try:
+        return lookup_fix(conn, error_text=error_text)
+    finally:
+        conn.close()
+
+
 def _should_override(fix: dict[str, Any]) -> tuple[bool, Optional[str]]:
     """Determine if a Memory fix should override Canon results.
 
@@ -462,11 +519,29 @@ def _should_override_convention(conv: dict[str, Any]) -> tuple[bool, Optional[st
 
 # ── Fork export ──────────────────────────────────────────────────────
 
+def _attach_fork_source(
+    dst: sqlite3.Connection, source: str | sqlite3.Connection,
+) -> None:
+    """Attach the fork source to dst as schema 'src'.
+
+    An open connection to an in-memory DB has no file to ATTACH, so its
+    pages are copied into an empty attached schema instead.
+    """
+    if isinstance(source, sqlite3.Connection):
+        filename = source.execute("PRAGMA database_list").fetchone()[2]
+        if not filename:
+            dst.execute("ATTACH DATABASE ':memory:' AS src")
+            dst.deserialize(source.serialize(), name="src")
+            return
+        source = filename
+    dst.execute("ATTACH DATABASE ? AS src", (source,))
+
+
 def export_for_fork(
-    db_path: str,
-    output_path: str,
+    db_path: str | sqlite3.Connection,
+    output_path: str | sqlite3.Connection,
     scope_filter: str = "team",
-) -> Path:
+) -> Path | sqlite3.Connection:
     """Export entries matching scope filter to a new DB for forking.
 
     scope_filter='team' includes team + org entries.
@@ -474,16 +549,24 @@ def export_for_fork(
 
     Strips session provenance. Does not copy sessions table rows.
     Conventions retain confidence but reset distinct_sessions to 1.
+
+    Either side may be an open connection instead of a path (e.g. :memory:
+    DBs in tests). An output connection must be empty; it is left open and
+    returned in place of the output path.
     """
-    out = Path(output_path)
-    out.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(output_path, sqlite3.Connection):
+        out = None
+        dst = output_path
+    else:
+        out = Path(output_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
 
-    # Remove existing output if present
-    if out.exists():
-        out.unlink()
+        # Remove existing output if present
+        if out.exists():
+            out.unlink()
+        dst = sqlite3.connect(str(out))
 
     # Create new DB with v2 schema
-    dst = sqlite3.connect(str(out))
     dst.executescript(SCHEMA_FILE.read_text())
 
     # Determine qualifying scopes
@@ -492,60 +575,45 @@ def export_for_fork(
     else:
         scopes = ("team", "org")
 
-    src = sqlite3.connect(db_path)
-    src.row_factory = sqlite3.Row
-
-    # Copy fixes
+    # Copy rows entirely inside SQLite: attach the source and INSERT ... SELECT
+    _attach_fork_source(dst, db_path)
     placeholders = ",".join("?" for _ in scopes)
-    fixes = src.execute(
-        f"SELECT * FROM fixes WHERE scope IN ({placeholders})", scopes
-    ).fetchall()
-    fix_count = 0
-    for f in fixes:
+
+    with dst:
+        # Copy fixes
         dst.execute(
-            """INSERT INTO fixes
-               (error_hash, error_text, root_cause, fix, resource, provider,
-                validated, scope, created_at, updated_at, hit_count, session_id)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)""",
-            (f["error_hash"], f["error_text"], f["root_cause"], f["fix"],
-             f["resource"], f["provider"], f["validated"], f["scope"],
-             f["created_at"], f["updated_at"], f["hit_count"]),
+            f"""INSERT INTO main.fixes
+                (error_hash, error_text, root_cause, fix, resource, provider,
+                 validated, scope, created_at, updated_at, hit_count, session_id)
+                SELECT error_hash, error_text, root_cause, fix, resource, provider,
+                       validated, scope, created_at, updated_at, hit_count, NULL
+                FROM src.fixes WHERE scope IN ({placeholders}) ORDER BY id""",
+            scopes,
         )
-        fix_count += 1
 
-    # Copy conventions (reset distinct_sessions to 1)
-    convs = src.execute(
-        f"SELECT * FROM conventions WHERE scope IN ({placeholders})", scopes
-    ).fetchall()
-    conv_count = 0
-    for c in convs:
+        # Copy conventions (reset distinct_sessions to 1)
         dst.execute(
-            """INSERT INTO conventions
-               (category, pattern, example, source, scope, created_at, updated_at,
-                confidence, session_id, distinct_sessions)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, 1)""",
-            (c["category"], c["pattern"], c["example"], c["source"], c["scope"],
-             c["created_at"], c["updated_at"], c["confidence"]),
+            f"""INSERT INTO main.conventions
+                (category, pattern, example, source, scope, created_at, updated_at,
+                 confidence, session_id, distinct_sessions)
+                SELECT category, pattern, example, source, scope, created_at, updated_at,
+                       confidence, NULL, 1
+                FROM src.conventions WHERE scope IN ({placeholders}) ORDER BY id""",
+            scopes,
         )
-        conv_count += 1
 
-    # Copy quirks
-    quirks = src.execute(
-        f"SELECT * FROM quirks WHERE scope IN ({placeholders})", scopes
-    ).fetchall()
-    quirk_count = 0
-    for q in quirks:
+        # Copy quirks
         dst.execute(
-            """INSERT INTO quirks
-               (service, description, region, workaround, scope, created_at, updated_at, session_id)
-               VALUES (?, ?, ?, ?, ?, ?, ?, NULL)""",
-            (q["service"], q["description"], q["region"], q["workaround"],
-             q["scope"], q["created_at"], q["updated_at"]),
+            f"""INSERT INTO main.quirks
+                (service, description, region, workaround, scope, created_at, updated_at, session_id)
+                SELECT service, description, region, workaround, scope, created_at, updated_at, NULL
+                FROM src.quirks WHERE scope IN ({placeholders}) ORDER BY id""",
+            scopes,
         )
-        quirk_count += 1
 
-    dst.commit()
-    src.close()
+    dst.execute("DETACH DATABASE src")
+    if out is None:
+        return dst
     dst.close()
 
     return out
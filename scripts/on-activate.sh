@@ -31,6 +31,12 @@ if [[ -f "${MEMORY_DB}" ]]; then
     fi
 fi
 
+# --- Bring lookup indexes up to date (idempotent; existing v2 DBs) ---
+if [[ -f "${MEMORY_DB}" && -f "${BOID_DIR}/memory/indexes.sql" ]]; then
+    sqlite3 "${MEMORY_DB}" < "${BOID_DIR}/memory/indexes.sql" 2>/dev/null || \
+        echo "[boid] WARNING: could not update Memories indexes"
+fi
+
 # --- Validate Canon files exist (Tier 1) ---
 canon_files=("error-signatures.json" "aws-limits.json" "provider-compat.json" "iam-eval-rules.json" "sg-interactions.json")
 canon_count=0
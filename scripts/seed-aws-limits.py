@@ -11,7 +11,7 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from canon_lib import load_canon, save_canon, make_meta
+from canon_lib import load_canon_for_write, save_canon, make_meta
 
 FILENAME = "aws-limits.json"
 
@@ -388,7 +388,7 @@ def build_limits() -> list[dict]:
 
 
 def main() -> None:
-    data = load_canon(FILENAME)
+    data = load_canon_for_write(FILENAME)
 
     data["_meta"] = make_meta(
         description="AWS service quotas and limits that commonly cause Terraform failures. Focuses on defaults that surprise people, not the full quota catalog.",
@@ -14,7 +14,7 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from canon_lib import load_canon, save_canon, make_meta, dedup_by_field
+from canon_lib import load_canon_for_write, save_canon, make_meta, dedup_by_field
 
 FILENAME = "error-signatures.json"
 
@@ -488,7 +488,7 @@ def channel_tribal() -> list[dict]:
 
 
 def main() -> None:
-    data = load_canon(FILENAME)
+    data = load_canon_for_write(FILENAME)
 
     data["_meta"] = make_meta(
         description="Error message signatures mapped to root causes and fixes. Each entry captures a known Terraform+AWS error pattern, its root cause, and the canonical fix.",
@@ -12,7 +12,7 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from canon_lib import load_canon, save_canon, make_meta
+from canon_lib import load_canon_for_write, save_canon, make_meta
 
 FILENAME = "iam-eval-rules.json"
 
@@ -267,7 +267,7 @@ def build_interaction_rules() -> list[dict]:
 
 
 def main() -> None:
-    data = load_canon(FILENAME)
+    data = load_canon_for_write(FILENAME)
 
     data["_meta"] = make_meta(
         description="IAM policy evaluation order and interaction rules. The full mental model for how AWS evaluates permissions — the part that trips everyone up.",
@@ -10,7 +10,7 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from canon_lib import load_canon, save_canon, make_meta
+from canon_lib import load_canon_for_write, save_canon, make_meta
 
 FILENAME = "provider-compat.json"
 
@@ -204,7 +204,7 @@ def build_compatibility() -> list[dict]:
 
 
 def main() -> None:
-    data = load_canon(FILENAME)
+    data = load_canon_for_write(FILENAME)
 
     data["_meta"] = make_meta(
         description="Terraform core and AWS provider version compatibility matrix. Captures breaking changes, deprecations, and required migration steps between versions.",
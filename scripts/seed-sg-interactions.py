@@ -12,7 +12,7 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from canon_lib import load_canon, save_canon, make_meta
+from canon_lib import load_canon_for_write, save_canon, make_meta
 
 FILENAME = "sg-interactions.json"
 
@@ -160,7 +160,7 @@ def build_patterns() -> list[dict]:
 
 
 def main() -> None:
-    data = load_canon(FILENAME)
+    data = load_canon_for_write(FILENAME)
 
     data["_meta"] = make_meta(
         description="Security group interaction patterns — circular dependencies, rule ordering, inline vs standalone conflicts, and Terraform-specific gotchas.",
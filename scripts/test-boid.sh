@@ -1,8 +1,9 @@
 #!/usr/bin/env bash
 # test-boid.sh — Run all boid test suites
 #
-# Usage: scripts/test-boid.sh [-v] [--suite SUITE]
+# Usage: scripts/test-boid.sh [-v] [-j] [--suite SUITE]
 #   -v          Verbose output
+#   -j          Run suites concurrently (output is still printed in suite order)
 #   --suite     Run a specific suite: canon, phase3, memory, e2e
 set -euo pipefail
 
@@ -12,14 +13,17 @@ cd "${PROJECT_ROOT}"
 
 VERBOSE=""
 SUITE="all"
+PARALLEL=false
 
 while [[ $# -gt 0 ]]; do
     case "$1" in
         -v) VERBOSE="-v"; shift ;;
+        -j) PARALLEL=true; shift ;;
         --suite) SUITE="$2"; shift 2 ;;
         -h|--help)
-            echo "Usage: scripts/test-boid.sh [-v] [--suite SUITE]"
+            echo "Usage: scripts/test-boid.sh [-v] [-j] [--suite SUITE]"
             echo "  -v          Verbose output"
+            echo "  -j          Run suites concurrently"
             echo "  --suite     Run a specific suite: canon, phase3, memory, e2e"
             exit 0
             ;;
@@ -30,9 +34,28 @@ done
 PASS=0
 FAIL=0
 
+# With -j, each step runs in the background with its output captured to a
+# log; finish_steps replays the logs in step order and tallies the results.
+# The suites share no state (temp DBs, separate fixture dirs), so they can
+# overlap safely.
+STEP_DIR=""
+STEP_LABELS=()
+STEP_PIDS=()
+if [[ "${PARALLEL}" == true ]]; then
+    STEP_DIR="$(mktemp -d)"
+    trap 'rm -rf "${STEP_DIR}"' EXIT
+fi
+
 run_step() {
     local label="$1"
     shift
+    if [[ "${PARALLEL}" == true ]]; then
+        local n=${#STEP_LABELS[@]}
+        STEP_LABELS+=("${label}")
+        "$@" > "${STEP_DIR}/${n}.log" 2>&1 &
+        STEP_PIDS+=($!)
+        return
+    fi
     echo ""
     echo "=== ${label} ==="
     if "$@"; then
@@ -43,6 +66,24 @@ run_step() {
     fi
 }
 
+finish_steps() {
+    local i
+    # Nothing ran in the background; bash < 4.4 treats an empty array as unset under set -u
+    (( ${#STEP_PIDS[@]} )) || return 0
+    for i in "${!STEP_PIDS[@]}"; do
+        echo ""
+        echo "=== ${STEP_LABELS[$i]} ==="
+        if wait "${STEP_PIDS[$i]}"; then
+            cat "${STEP_DIR}/${i}.log"
+            PASS=$((PASS + 1))
+        else
+            cat "${STEP_DIR}/${i}.log"
+            FAIL=$((FAIL + 1))
+            echo "FAILED: ${STEP_LABELS[$i]}"
+        fi
+    done
+}
+
 # Step 1: Canon JSON validation
 if [[ "${SUITE}" == "all" || "${SUITE}" == "canon" ]]; then
     run_step "Canon JSON validation" bash -c '
@@ -73,6 +114,8 @@ if [[ "${SUITE}" == "all" || "${SUITE}" == "e2e" ]]; then
     run_step "E2E scenario tests" python3 -m unittest discover tests/e2e/ ${VERBOSE}
 fi
 
+finish_steps
+
 echo ""
 echo "================================"
 echo "Results: ${PASS} passed, ${FAIL} failed"
@@ -9,76 +9,177 @@ Usage:
     terraform show -json tfplan | python3 tf_plan_analyzer.py
     python3 tf_plan_analyzer.py plan.json
     python3 tf_plan_analyzer.py plan.json --format text
+    python3 tf_plan_analyzer.py --batch plans/*.json
 """
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import operator
 import re
 import sys
+import textwrap
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, BinaryIO, Callable, Mapping
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from canon_lib import load_canon, match_error, search_by_resource
+from canon_lib import limits_by_service, load_canon, match_error, search_by_resource
+
+
+# Resource types whose creation counts against a service quota in aws-limits.json
+SERVICE_MAP: Mapping[str, str] = MappingProxyType({
+    "aws_vpc": "ec2",
+    "aws_subnet": "ec2",
+    "aws_security_group": "ec2",
+    "aws_instance": "ec2",
+    "aws_eip": "ec2",
+    "aws_s3_bucket": "s3",
+    "aws_iam_role": "iam",
+    "aws_iam_policy": "iam",
+    "aws_iam_user": "iam",
+    "aws_db_instance": "rds",
+    "aws_rds_cluster": "rds",
+    "aws_ecs_cluster": "ecs",
+    "aws_ecs_service": "ecs",
+    "aws_ecs_task_definition": "ecs",
+    "aws_lambda_function": "lambda",
+    "aws_dynamodb_table": "dynamodb",
+    "aws_sqs_queue": "sqs",
+    "aws_sns_topic": "sns",
+    "aws_lb": "elbv2",
+    "aws_alb": "elbv2",
+})
+
+
+def _canon_entries(filename: str, list_key: str) -> list[dict]:
+    """Return one list from a Canon file, or [] if the file is missing or invalid.
+
+    load_canon caches each parse per process (invalidated on mtime change), so
+    analyzing many plans in one process reads each Canon file once.
+    """
+    try:
+        return load_canon(filename).get(list_key, [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
 
 
-def parse_plan(plan_data: dict[str, Any]) -> dict[str, Any]:
-    """Extract structured summary from terraform plan JSON."""
-    resource_changes = plan_data.get("resource_changes", [])
-    diagnostics = plan_data.get("diagnostics", [])
+def _slim_resource_change(rc: dict[str, Any]) -> dict[str, Any]:
+    """Keep only address, type and change.actions of one resource change."""
+    slim = {key: rc[key] for key in ("address", "type") if key in rc}
+    change = rc.get("change")
+    if change is not None:
+        slim["change"] = {"actions": change["actions"]} if "actions" in change else {}
+    return slim
+
+
+def load_plan(fp: BinaryIO) -> dict[str, Any]:
+    """Read plan JSON and keep only the parts the analyzer reads.
 
-    actions: dict[str, list[str]] = {
-        "create": [],
-        "update": [],
-        "delete": [],
-        "no-op": [],
-        "read": [],
+    Large plans are dominated by planned_values/prior_state and by the
+    before/after state of each resource change, which no check uses; dropping
+    them right after parsing frees that memory before analysis.
+    """
+    data = json.loads(fp.read())
+    plan: dict[str, Any] = {
+        key: data[key]
+        for key in ("terraform_version", "diagnostics")
+        if key in data
     }
+    resource_changes = data.get("resource_changes")
+    if resource_changes is not None:
+        plan["resource_changes"] = [_slim_resource_change(rc) for rc in resource_changes]
+    provider_config = data.get("configuration", {}).get("provider_config")
+    if provider_config is not None:
+        plan["configuration"] = {"provider_config": provider_config}
+    return plan
 
-    resource_types: set[str] = set()
 
-    for rc in resource_changes:
-        rtype = rc.get("type", "unknown")
-        address = rc.get("address", "unknown")
-        resource_types.add(rtype)
+# Summary action buckets, in output order
+_ACTIONS = ("create", "update", "delete", "no-op", "read")
+_ACTION_SET = frozenset(_ACTIONS)
 
-        change = rc.get("change", {})
-        rc_actions = change.get("actions", [])
+_ResourceScan = tuple[dict[str, list[str]], list[str], list[str], set[str]]
 
-        for action in rc_actions:
-            if action in actions:
-                actions[action].append(address)
+
+def _scan_resources(resource_changes: list[dict]) -> _ResourceScan:
+    """Walk resource_changes once for every stage that needs it.
+
+    Returns (addresses per action, sorted summary types, sorted searchable
+    types, types being created). Only actions that occur get a bucket.
+    Summary types report a missing type as "unknown"; searchable types leave
+    it out. analyze() runs this once and hands the result to each stage.
+    """
+    actions: dict[str, list[str]] = {}
+    types: set[str] = set()
+    missing_type = False
+    creating: set[str] = set()
+
+    # Bound once; these run per resource on plans with thousands of changes
+    add_type = types.add
+    get_bucket = actions.get
+
+    for rc in resource_changes:
+        rtype = rc.get("type")
+        if rtype is None:
+            missing_type = True
+        else:
+            add_type(rtype)
+
+        # No {} / [] defaults: most lookups hit, and misses need no allocation
+        change = rc.get("change")
+        rc_actions = change.get("actions") if change else None
+        if rc_actions:
+            address = rc.get("address", "unknown")
+            for action in rc_actions:
+                if action in _ACTION_SET:
+                    bucket = get_bucket(action)
+                    if bucket is None:
+                        bucket = actions[action] = []
+                    bucket.append(address)
+            if "create" in rc_actions:
+                creating.add(rtype or "")
+
+    summary_types = sorted(types | {"unknown"} if missing_type else types)
+    search_types = sorted(t for t in types if t)
+    if len(actions) > 1:
+        # Buckets are created in first-seen order; the summary lists them in _ACTIONS order
+        actions = {action: actions[action] for action in _ACTIONS if action in actions}
+    return actions, summary_types, search_types, creating
+
+
+def parse_plan(plan_data: dict[str, Any], scan: _ResourceScan | None = None) -> dict[str, Any]:
+    """Extract structured summary from terraform plan JSON."""
+    resource_changes = plan_data.get("resource_changes", [])
+    diagnostics = plan_data.get("diagnostics", [])
+    actions, resource_types, _, _ = scan or _scan_resources(resource_changes)
 
     return {
         "total_changes": len(resource_changes),
-        "actions": {k: v for k, v in actions.items() if v},
-        "resource_types": sorted(resource_types),
+        "actions": actions,
+        "resource_types": resource_types,
         "diagnostics_count": len(diagnostics),
         "terraform_version": plan_data.get("terraform_version", "unknown"),
     }
 
 
-def find_canon_matches(plan_data: dict[str, Any]) -> dict[str, Any]:
+def find_canon_matches(plan_data: dict[str, Any], scan: _ResourceScan | None = None) -> dict[str, Any]:
     """Cross-reference plan contents against Canon knowledge."""
     resource_changes = plan_data.get("resource_changes", [])
     diagnostics = plan_data.get("diagnostics", [])
 
-    # Collect unique resource types
-    resource_types: set[str] = set()
-    for rc in resource_changes:
-        resource_types.add(rc.get("type", ""))
+    _, _, resource_types, _ = scan or _scan_resources(resource_changes)
 
     # Search Canon by resource type
     canon_findings: list[dict] = []
-    seen_entries: set[str] = set()
-    for rtype in sorted(resource_types):
-        if not rtype:
-            continue
+    # Canon entries are shared dicts from the load_canon cache, so identity dedups them
+    seen_entries: set[int] = set()
+    for rtype in resource_types:
         results = search_by_resource(rtype)
         for r in results:
-            key = json.dumps(r["entry"], sort_keys=True)
+            key = id(r["entry"])
             if key not in seen_entries:
                 seen_entries.add(key)
                 canon_findings.append({
@@ -88,16 +189,17 @@ def find_canon_matches(plan_data: dict[str, Any]) -> dict[str, Any]:
                 })
 
     # Match diagnostics against error signatures
+    # match_error reuses precompiled patterns for this signature list across calls;
+    # identical diagnostic texts (same error on many addresses) are matched once.
     diagnostic_matches: list[dict] = []
-    try:
-        sigs_data = load_canon("error-signatures.json")
-        sigs = sigs_data.get("signatures", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        sigs = []
+    sigs = _canon_entries("error-signatures.json", "signatures") if diagnostics else []
+    matches_by_text: dict[str, list[dict]] = {}
 
     for diag in diagnostics:
         error_text = f"{diag.get('summary', '')} {diag.get('detail', '')}"
-        matches = match_error(error_text, sigs)
+        if error_text not in matches_by_text:
+            matches_by_text[error_text] = match_error(error_text, sigs)
+        matches = list(matches_by_text[error_text])
         if matches:
             diagnostic_matches.append({
                 "diagnostic": {
@@ -118,238 +220,282 @@ def check_provider_compat(plan_data: dict[str, Any]) -> list[dict]:
     """Check provider versions in the plan against provider-compat.json."""
     warnings: list[dict] = []
 
-    try:
-        compat_data = load_canon("provider-compat.json")
-        compat_entries = compat_data.get("compatibility", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return warnings
-
     tf_version = plan_data.get("terraform_version", "")
     if not tf_version:
         return warnings
 
-    # Extract provider versions from configuration
+    # Only AWS providers with a version constraint can be flagged; plans
+    # without one skip the Canon lookup and range checks entirely
     config = plan_data.get("configuration", {})
     provider_config = config.get("provider_config", {})
+    aws_constraints = [
+        pconfig.get("version_constraint", "")
+        for provider_key, pconfig in provider_config.items()
+        if "aws" in provider_key.lower() and pconfig.get("version_constraint", "")
+    ]
+    if not aws_constraints:
+        return warnings
+
+    compat_entries = _canon_entries("provider-compat.json", "compatibility")
+
+    # Breaking combinations depend only on the TF version, so resolve them once
+    # and fan the hits out across AWS provider configs
+    breaking = [
+        entry for entry in compat_entries
+        if entry.get("status") == "breaking"
+        and _version_in_range(tf_version, entry.get("terraform_version", ""))
+    ]
 
-    for provider_key, pconfig in provider_config.items():
-        if "aws" not in provider_key.lower():
-            continue
-        # Provider version might be in version_constraint
-        version_constraint = pconfig.get("version_constraint", "")
-        if not version_constraint:
-            continue
-
-        # Check against compat entries for breaking combinations
-        for entry in compat_entries:
-            if entry.get("status") == "breaking":
-                # Check if TF version matches
-                tf_range = entry.get("terraform_version", "")
-                if _version_in_range(tf_version, tf_range):
-                    warnings.append({
-                        "terraform_version": tf_version,
-                        "provider_constraint": version_constraint,
-                        "compat_entry": entry,
-                    })
+    for version_constraint in aws_constraints:
+        for entry in breaking:
+            warnings.append({
+                "terraform_version": tf_version,
+                "provider_constraint": version_constraint,
+                "compat_entry": entry,
+            })
 
     return warnings
 
 
-def check_limit_warnings(plan_data: dict[str, Any]) -> list[dict]:
+def check_limit_warnings(plan_data: dict[str, Any], scan: _ResourceScan | None = None) -> list[dict]:
     """Check if resource creates might hit known AWS limits."""
     warnings: list[dict] = []
 
     try:
-        limits_data = load_canon("aws-limits.json")
-        limits = limits_data.get("limits", [])
+        by_service = limits_by_service()
     except (FileNotFoundError, json.JSONDecodeError):
         return warnings
+    if not by_service:
+        return warnings
 
     resource_changes = plan_data.get("resource_changes", [])
 
-    # Count creates per resource type
-    create_counts: dict[str, int] = {}
-    for rc in resource_changes:
-        change = rc.get("change", {})
-        if "create" in change.get("actions", []):
-            rtype = rc.get("type", "")
-            create_counts[rtype] = create_counts.get(rtype, 0) + 1
-
-    # Map resource types to services
-    service_map = {
-        "aws_vpc": "ec2",
-        "aws_subnet": "ec2",
-        "aws_security_group": "ec2",
-        "aws_instance": "ec2",
-        "aws_eip": "ec2",
-        "aws_s3_bucket": "s3",
-        "aws_iam_role": "iam",
-        "aws_iam_policy": "iam",
-        "aws_iam_user": "iam",
-        "aws_db_instance": "rds",
-        "aws_rds_cluster": "rds",
-        "aws_ecs_cluster": "ecs",
-        "aws_ecs_service": "ecs",
-        "aws_ecs_task_definition": "ecs",
-        "aws_lambda_function": "lambda",
-        "aws_dynamodb_table": "dynamodb",
-        "aws_sqs_queue": "sqs",
-        "aws_sns_topic": "sns",
-        "aws_lb": "elbv2",
-        "aws_alb": "elbv2",
-    }
+    _, _, _, creating = scan or _scan_resources(resource_changes)
 
     services_creating: set[str] = set()
-    for rtype in create_counts:
-        service = service_map.get(rtype)
+    for rtype in creating:
+        service = SERVICE_MAP.get(rtype)
         if service:
             services_creating.add(service)
 
-    for limit in limits:
-        if limit.get("service", "") in services_creating:
-            warnings.append({
-                "service": limit["service"],
-                "limit": limit["limit_name"],
-                "default_value": limit["default_value"],
-                "terraform_impact": limit["terraform_impact"],
-            })
+    # Only touch the limits for services being created; walking the index in
+    # its own order keeps warnings in aws-limits.json order, which groups
+    # limits by service.
+    hits = (
+        limit
+        for service, limits in by_service.items() if service in services_creating
+        for limit in limits
+    )
+    for limit in hits:
+        warnings.append({
+            "service": limit["service"],
+            "limit": limit["limit_name"],
+            "default_value": limit["default_value"],
+            "terraform_impact": limit["terraform_impact"],
+        })
 
     return warnings
 
 
+_CONSTRAINT_RE = re.compile(r"([><=!]+)\s*([\d.]+)")
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_version(version: str) -> tuple[int, ...]:
+    """Parse a dotted version into an int tuple that compares like the version.
+
+    Non-numeric components are dropped and trailing zeros stripped, so
+    "1.5" and "1.5.0" parse equal.
+    """
+    parts = [int(x) for x in version.split(".") if x.isdigit()]
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def _parse_range(range_str: str) -> tuple[tuple[str, tuple[int, ...]], ...]:
+    """Parse a constraint string like ">=1.5.0, <1.6.0" into (op, version) pairs.
+
+    Parts that are not a plain comparison (e.g. "OpenTofu >=1.6.0") are skipped.
+    """
+    constraints = []
+    for part in range_str.split(","):
+        match = _CONSTRAINT_RE.match(part.strip())
+        if match:
+            constraints.append((match.group(1), _parse_version(match.group(2))))
+    return tuple(constraints)
+
+
+_RANGE_OPS: Mapping[str, Callable[[Any, Any], bool]] = MappingProxyType({
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _range_checker(range_str: str) -> Callable[[tuple[int, ...]], bool]:
+    """Specialize a constraint string into a predicate over parsed versions.
+
+    The Canon matrix only has a handful of distinct ranges, so each one is
+    reduced to its (comparison, bound) pairs once and reused for every plan.
+    Unknown operators are ignored, as before.
+    """
+    checks = tuple(
+        (_RANGE_OPS[op], target) for op, target in _parse_range(range_str)
+        if op in _RANGE_OPS
+    )
+    if not checks:
+        return lambda v: True
+    if len(checks) == 1:
+        (cmp, target), = checks
+        return lambda v: cmp(v, target)
+    return lambda v: all(cmp(v, target) for cmp, target in checks)
+
+
 def _version_in_range(version: str, range_str: str) -> bool:
     """Simple check if a version string falls within a constraint range.
 
     Handles ranges like ">=1.5.0, <1.6.0". Not a full semver solver —
     just enough for our compat matrix.
     """
-    parts = [p.strip() for p in range_str.split(",")]
-    for part in parts:
-        match = re.match(r"([><=!]+)\s*([\d.]+)", part)
-        if not match:
-            continue
-        op, target = match.group(1), match.group(2)
-        cmp = _compare_versions(version, target)
-        if op == ">=" and cmp < 0:
-            return False
-        if op == ">" and cmp <= 0:
-            return False
-        if op == "<" and cmp >= 0:
-            return False
-        if op == "<=" and cmp > 0:
-            return False
-        if op == "=" and cmp != 0:
-            return False
-    return True
-
-
-def _compare_versions(a: str, b: str) -> int:
-    """Compare two dotted version strings. Returns -1, 0, or 1."""
-    def parts(v: str) -> list[int]:
-        return [int(x) for x in v.split(".") if x.isdigit()]
-    pa, pb = parts(a), parts(b)
-    for i in range(max(len(pa), len(pb))):
-        va = pa[i] if i < len(pa) else 0
-        vb = pb[i] if i < len(pb) else 0
-        if va < vb:
-            return -1
-        if va > vb:
-            return 1
-    return 0
+    return _range_checker(range_str)(_parse_version(version))
 
 
 def analyze(plan_data: dict[str, Any]) -> dict[str, Any]:
     """Run full analysis on a terraform plan JSON."""
+    # One pass over resource_changes feeds every stage
+    scan = _scan_resources(plan_data.get("resource_changes", []))
     return {
-        "plan_summary": parse_plan(plan_data),
-        **find_canon_matches(plan_data),
+        "plan_summary": parse_plan(plan_data, scan),
+        **find_canon_matches(plan_data, scan),
         "compat_warnings": check_provider_compat(plan_data),
-        "limit_warnings": check_limit_warnings(plan_data),
+        "limit_warnings": check_limit_warnings(plan_data, scan),
     }
 
 
+# Entry fields echoed under each Canon finding in text output, in display order
+_FINDING_FIELDS = (("root_cause", "Root cause"), ("fix", "Fix"), ("solution", "Solution"))
+
+
 def format_text(result: dict[str, Any]) -> str:
     """Format analysis result as human-readable text."""
     lines: list[str] = []
+    add = lines.append  # bound once; called per line on large batch reports
     summary = result.get("plan_summary", {})
 
-    lines.append("=== Terraform Plan Analysis ===")
-    lines.append(f"Terraform version: {summary.get('terraform_version', 'unknown')}")
-    lines.append(f"Total resource changes: {summary.get('total_changes', 0)}")
+    add("=== Terraform Plan Analysis ===")
+    add(f"Terraform version: {summary.get('terraform_version', 'unknown')}")
+    add(f"Total resource changes: {summary.get('total_changes', 0)}")
 
     for action, resources in summary.get("actions", {}).items():
-        lines.append(f"  {action}: {len(resources)} ({', '.join(resources[:5])}{'...' if len(resources) > 5 else ''})")
+        add(f"  {action}: {len(resources)} ({', '.join(resources[:5])}{'...' if len(resources) > 5 else ''})")
 
     canon = result.get("canon_findings", [])
     if canon:
-        lines.append(f"\n=== Canon Findings ({len(canon)}) ===")
+        add(f"\n=== Canon Findings ({len(canon)}) ===")
         for f in canon:
             entry = f["entry"]
             name = entry.get("error_pattern") or entry.get("pattern_name") or entry.get("limit_name", "?")
-            lines.append(f"  [{f['source']}] {name}")
-            if "root_cause" in entry:
-                lines.append(f"    Root cause: {entry['root_cause'][:120]}...")
-            if "fix" in entry:
-                lines.append(f"    Fix: {entry['fix'][:120]}...")
-            if "solution" in entry:
-                lines.append(f"    Solution: {entry['solution'][:120]}...")
+            add(f"  [{f['source']}] {name}")
+            for key, label in _FINDING_FIELDS:
+                if key in entry:
+                    add(f"    {label}: {entry[key][:120]}...")
 
     diag = result.get("diagnostic_matches", [])
     if diag:
-        lines.append(f"\n=== Diagnostic Matches ({len(diag)}) ===")
+        add(f"\n=== Diagnostic Matches ({len(diag)}) ===")
         for d in diag:
-            lines.append(f"  [{d['diagnostic']['severity']}] {d['diagnostic']['summary']}")
+            add(f"  [{d['diagnostic']['severity']}] {d['diagnostic']['summary']}")
             for m in d["canon_matches"]:
-                lines.append(f"    Canon match: {m.get('error_pattern', '?')}")
-                lines.append(f"    Fix: {m.get('fix', '?')[:120]}...")
+                add(f"    Canon match: {m.get('error_pattern', '?')}")
+                add(f"    Fix: {m.get('fix', '?')[:120]}...")
 
     compat = result.get("compat_warnings", [])
     if compat:
-        lines.append(f"\n=== Compatibility Warnings ({len(compat)}) ===")
+        add(f"\n=== Compatibility Warnings ({len(compat)}) ===")
         for w in compat:
-            lines.append(f"  TF {w['terraform_version']} + provider {w['provider_constraint']}: BREAKING")
+            add(f"  TF {w['terraform_version']} + provider {w['provider_constraint']}: BREAKING")
 
     limits = result.get("limit_warnings", [])
     if limits:
-        lines.append(f"\n=== Limit Warnings ({len(limits)}) ===")
+        add(f"\n=== Limit Warnings ({len(limits)}) ===")
         for w in limits:
-            lines.append(f"  [{w['service']}] {w['limit']}: default {w['default_value']}")
-            lines.append(f"    Impact: {w['terraform_impact'][:120]}...")
+            add(f"  [{w['service']}] {w['limit']}: default {w['default_value']}")
+            add(f"    Impact: {w['terraform_impact'][:120]}...")
 
     if not any([canon, diag, compat, limits]):
-        lines.append("\nNo Canon findings for this plan.")
+        add("\nNo Canon findings for this plan.")
 
     return "\n".join(lines)
 
 
-def main() -> None:
+def _read_plan(plan_file: str) -> dict[str, Any]:
+    """Load one plan from a path, or from stdin when the path is '-'."""
+    if plan_file == "-":
+        return load_plan(sys.stdin.buffer)
+    with open(plan_file, "rb") as f:
+        return load_plan(f)
+
+
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         description="Analyze terraform plan JSON against Canon knowledge",
     )
     parser.add_argument(
-        "plan_file", nargs="?", default="-",
+        "plan_files", nargs="*", default=["-"], metavar="plan_file",
         help="Path to plan JSON file (default: stdin)",
     )
     parser.add_argument(
         "--format", choices=["json", "text"], default="json",
         help="Output format (default: json)",
     )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Analyze every plan_file in one process; JSON output is an array. "
+             "A plan that fails gets an error entry and the exit status is 1",
+    )
 
-    args = parser.parse_args()
-
-    if args.plan_file == "-":
-        plan_data = json.load(sys.stdin)
-    else:
-        with open(args.plan_file) as f:
-            plan_data = json.load(f)
-
-    result = analyze(plan_data)
-
-    if args.format == "text":
-        print(format_text(result))
-    else:
-        json.dump(result, sys.stdout, indent=2)
-        print()
+    args = parser.parse_args(argv)
+    if len(args.plan_files) > 1 and not args.batch:
+        parser.error("multiple plan files require --batch")
+
+    if not args.batch:
+        result = analyze(_read_plan(args.plan_files[0]))
+        if args.format == "text":
+            print(format_text(result))
+        else:
+            # One write of the full document; json.dump would issue a write per token
+            sys.stdout.write(json.dumps(result, indent=2) + "\n")
+        return
+
+    # Canon files and their indexes are cached per process, so only the
+    # first plan pays for loading them. Each report is written as soon as its
+    # plan is analyzed, and a plan that fails is reported against its file
+    # without stopping the rest of the batch.
+    write = sys.stdout.write
+    separator = ""
+    failed = 0
+    for i, plan_file in enumerate(args.plan_files):
+        try:
+            result = {"plan_file": plan_file, **analyze(_read_plan(plan_file))}
+        except Exception as e:
+            print(f"ERROR: {plan_file}: {e}", file=sys.stderr)
+            failed += 1
+            result = {"plan_file": plan_file, "error": str(e)}
+        if args.format == "text":
+            body = f"ERROR: {result['error']}" if "error" in result else format_text(result)
+            write(f"{separator}##### {plan_file}\n{body}")
+            separator = "\n\n"
+        else:
+            # Elements indented as json.dumps would indent them inside the array
+            write(("[\n" if i == 0 else ",\n") + textwrap.indent(json.dumps(result, indent=2), "  "))
+        sys.stdout.flush()
+    write("\n" if args.format == "text" else "\n]\n")
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -8,10 +8,12 @@ Uses stdlib unittest only — no pip dependencies.
 """
 from __future__ import annotations
 
+import functools
 import json
 import re
 import sys
 import unittest
+from collections import Counter
 from pathlib import Path
 
 # Add scripts/ to path for canon_lib imports
@@ -23,9 +25,10 @@ CANON_DIR = Path(__file__).resolve().parent.parent.parent / "canon"
 TEST_DATA_DIR = Path(__file__).resolve().parent / "test_data"
 
 
+@functools.lru_cache(maxsize=None)
 def load_json(path: Path) -> dict:
-    with open(path) as f:
-        return json.load(f)
+    """Parse a JSON file once per run; test classes share the result read-only."""
+    return json.loads(path.read_bytes())
 
 
 class TestErrorSignatures(unittest.TestCase):
@@ -36,11 +39,16 @@ class TestErrorSignatures(unittest.TestCase):
         cls.data = load_json(CANON_DIR / "error-signatures.json")
         cls.sigs = cls.data["signatures"]
         cls.test_data = load_json(TEST_DATA_DIR / "sample_errors.json")
-
-    def test_meta_present(self):
-        self.assertIn("_meta", self.data)
-        for field in ("source", "version", "date", "description"):
-            self.assertIn(field, self.data["_meta"])
+        # Compile each pattern once for every test that needs it; failures are
+        # reported by test_error_patterns_are_valid_regex
+        cls.compiled: dict[str, re.Pattern[str]] = {}
+        cls.regex_errors: dict[str, re.error] = {}
+        for sig in cls.sigs:
+            pattern = sig["error_pattern"]
+            try:
+                cls.compiled[pattern] = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                cls.regex_errors[pattern] = e
 
     def test_minimum_entries(self):
         self.assertGreaterEqual(len(self.sigs), 50, "Need at least 50 error signatures")
@@ -48,8 +56,8 @@ class TestErrorSignatures(unittest.TestCase):
     def test_required_fields(self):
         required = {"error_pattern", "provider", "resource", "root_cause", "fix", "severity", "tags"}
         for sig in self.sigs:
-            for field in required:
-                self.assertIn(field, sig, f"Signature missing '{field}': {sig.get('error_pattern', 'unknown')}")
+            missing = required - sig.keys()
+            self.assertFalse(missing, f"Signature missing {sorted(missing)}: {sig.get('error_pattern', 'unknown')}")
 
     def test_valid_severity(self):
         valid = {"critical", "high", "medium", "low"}
@@ -58,15 +66,14 @@ class TestErrorSignatures(unittest.TestCase):
                 f"Invalid severity '{sig['severity']}' for: {sig['error_pattern']}")
 
     def test_error_patterns_are_valid_regex(self):
-        for sig in self.sigs:
-            try:
-                re.compile(sig["error_pattern"])
-            except re.error as e:
-                self.fail(f"Invalid regex '{sig['error_pattern']}': {e}")
+        # Patterns were compiled once in setUpClass; report every failure together
+        self.assertFalse(self.regex_errors, "Invalid regex: " + "; ".join(
+            f"'{pattern}': {e}" for pattern, e in self.regex_errors.items()))
 
     def test_unique_error_patterns(self):
         patterns = [s["error_pattern"] for s in self.sigs]
-        self.assertEqual(len(patterns), len(set(patterns)), "Duplicate error_pattern values found")
+        dups = sorted(k for k, count in Counter(patterns).items() if count > 1)
+        self.assertFalse(dups, f"Duplicate error_pattern values found: {dups}")
 
     def test_tags_are_lists(self):
         for sig in self.sigs:
@@ -86,7 +93,7 @@ class TestErrorSignatures(unittest.TestCase):
                 # Verify at least one match has a plausible pattern
                 patterns = [m["error_pattern"] for m in matches]
                 self.assertTrue(
-                    any(re.search(p, err["raw_error"], re.IGNORECASE) for p in patterns),
+                    any(self.compiled[p].search(err["raw_error"]) for p in patterns),
                     f"False positive match for {err['id']}: {err['description']}"
                 )
         self.assertGreaterEqual(matched_count, 10,
@@ -95,17 +102,13 @@ class TestErrorSignatures(unittest.TestCase):
     def test_non_matching_errors_dont_match(self):
         """Test that unrelated errors don't false-positive match."""
         non_matching = self.test_data["non_matching_errors"]
-        for err in non_matching:
-            matches = match_error(err["raw_error"], self.sigs)
-            # Some may match generically — that's OK. But they shouldn't match with high specificity.
-            # We just check that the total false positive rate is low.
-            if matches:
-                # Allow up to 2 non-matching errors to have incidental matches
-                pass
-        # This is a soft test — we just want awareness, not strict failure
-        total_matches = sum(1 for err in non_matching if match_error(err["raw_error"], self.sigs))
-        self.assertLessEqual(total_matches, 3,
-            f"{total_matches}/5 non-matching errors had matches — patterns may be too broad")
+        # Some may match generically — that's OK. But they shouldn't match with high specificity.
+        # We just check that the total false positive rate is low; allow a few
+        # incidental matches. This is a soft test — awareness, not strict failure.
+        matched_ids = [err["id"] for err in non_matching if match_error(err["raw_error"], self.sigs)]
+        self.assertLessEqual(len(matched_ids), 3,
+            f"{len(matched_ids)}/{len(non_matching)} non-matching errors had matches "
+            f"({', '.join(matched_ids)}) — patterns may be too broad")
 
 
 class TestAWSLimits(unittest.TestCase):
@@ -115,9 +118,7 @@ class TestAWSLimits(unittest.TestCase):
     def setUpClass(cls):
         cls.data = load_json(CANON_DIR / "aws-limits.json")
         cls.limits = cls.data["limits"]
-
-    def test_meta_present(self):
-        self.assertIn("_meta", self.data)
+        cls.services = {limit["service"] for limit in cls.limits}
 
     def test_minimum_entries(self):
         self.assertGreaterEqual(len(self.limits), 30, "Need at least 30 AWS limit entries")
@@ -126,13 +127,12 @@ class TestAWSLimits(unittest.TestCase):
         required = {"service", "limit_name", "default_value", "unit", "adjustable",
                      "terraform_impact", "regions_vary", "notes"}
         for limit in self.limits:
-            for field in required:
-                self.assertIn(field, limit, f"Limit missing '{field}': {limit.get('limit_name', 'unknown')}")
+            missing = required - limit.keys()
+            self.assertFalse(missing, f"Limit missing {sorted(missing)}: {limit.get('limit_name', 'unknown')}")
 
     def test_service_lowercase(self):
-        for limit in self.limits:
-            self.assertEqual(limit["service"], limit["service"].lower(),
-                f"Service should be lowercase: {limit['service']}")
+        not_lower = sorted(s for s in self.services if s != s.lower())
+        self.assertFalse(not_lower, f"Service should be lowercase: {not_lower}")
 
     def test_terraform_impact_non_empty(self):
         for limit in self.limits:
@@ -146,8 +146,7 @@ class TestAWSLimits(unittest.TestCase):
             "dynamodb", "sqs", "sns", "route53", "acm", "secretsmanager",
             "cloudwatch", "sts"
         }
-        covered = {limit["service"] for limit in self.limits}
-        missing = localstack_services - covered
+        missing = localstack_services - self.services
         self.assertEqual(missing, set(),
             f"LocalStack services not covered: {missing}")
 
@@ -164,9 +163,16 @@ class TestProviderCompat(unittest.TestCase):
     def setUpClass(cls):
         cls.data = load_json(CANON_DIR / "provider-compat.json")
         cls.compat = cls.data["compatibility"]
-
-    def test_meta_present(self):
-        self.assertIn("_meta", self.data)
+        # Leading major.minor / major of every version in each range string,
+        # e.g. ">=1.5.0, <1.6.0" → {"1.5", "1.6"} and "4.x → 5.x migration" → {"4", "5"}
+        cls.tf_minors = {
+            v for e in cls.compat
+            for v in re.findall(r"(?<![\d.])(\d+\.\d+)", e["terraform_version"])
+        }
+        cls.provider_majors = {
+            v for e in cls.compat
+            for v in re.findall(r"(?<![\d.])(\d+)\.", e["provider_version"])
+        }
 
     def test_minimum_entries(self):
         self.assertGreaterEqual(len(self.compat), 12, "Need at least 12 compatibility entries")
@@ -175,9 +181,9 @@ class TestProviderCompat(unittest.TestCase):
         required = {"terraform_version", "provider_version", "status",
                      "breaking_changes", "migration_notes"}
         for entry in self.compat:
-            for field in required:
-                self.assertIn(field, entry,
-                    f"Compat entry missing '{field}': TF {entry.get('terraform_version', '?')} / AWS {entry.get('provider_version', '?')}")
+            missing = required - entry.keys()
+            self.assertFalse(missing,
+                f"Compat entry missing {sorted(missing)}: TF {entry.get('terraform_version', '?')} / AWS {entry.get('provider_version', '?')}")
 
     def test_valid_status(self):
         valid = {"compatible", "deprecated", "breaking"}
@@ -187,17 +193,15 @@ class TestProviderCompat(unittest.TestCase):
 
     def test_tf_versions_covered(self):
         """Verify TF 1.5, 1.6, 1.7, 1.8 are covered."""
-        all_tf_versions = " ".join(e["terraform_version"] for e in self.compat)
         for ver in ["1.5", "1.6", "1.7", "1.8"]:
-            self.assertIn(ver, all_tf_versions,
+            self.assertIn(ver, self.tf_minors,
                 f"Terraform {ver} not covered in compatibility matrix")
 
     def test_provider_versions_covered(self):
         """Verify provider 4.x, 5.x, 6.x are covered."""
-        all_provider_versions = " ".join(e["provider_version"] for e in self.compat)
-        for ver in ["4.", "5.", "6."]:
-            self.assertIn(ver, all_provider_versions,
-                f"Provider {ver}x not covered in compatibility matrix")
+        for ver in ["4", "5", "6"]:
+            self.assertIn(ver, self.provider_majors,
+                f"Provider {ver}.x not covered in compatibility matrix")
 
     def test_breaking_changes_is_list(self):
         for entry in self.compat:
@@ -214,9 +218,6 @@ class TestIAMEvalRules(unittest.TestCase):
         cls.eval_order = cls.data["evaluation_order"]
         cls.interactions = cls.data["interaction_rules"]
 
-    def test_meta_present(self):
-        self.assertIn("_meta", self.data)
-
     def test_minimum_eval_order(self):
         self.assertGreaterEqual(len(self.eval_order), 10, "Need at least 10 evaluation order entries")
 
@@ -229,14 +230,15 @@ class TestIAMEvalRules(unittest.TestCase):
 
     def test_eval_order_unique_names(self):
         names = [e["rule_name"] for e in self.eval_order]
-        self.assertEqual(len(names), len(set(names)), "Duplicate rule_name in evaluation_order")
+        dups = sorted(k for k, count in Counter(names).items() if count > 1)
+        self.assertFalse(dups, f"Duplicate rule_name in evaluation_order: {dups}")
 
     def test_eval_order_required_fields(self):
         required = {"rule_order", "rule_name", "description", "terraform_relevance",
                      "common_mistakes", "examples"}
         for entry in self.eval_order:
-            for field in required:
-                self.assertIn(field, entry, f"eval_order entry missing '{field}': {entry.get('rule_name', '?')}")
+            missing = required - entry.keys()
+            self.assertFalse(missing, f"eval_order entry missing {sorted(missing)}: {entry.get('rule_name', '?')}")
 
     def test_common_mistakes_non_empty(self):
         for entry in self.eval_order:
@@ -247,12 +249,13 @@ class TestIAMEvalRules(unittest.TestCase):
     def test_interaction_required_fields(self):
         required = {"rule_name", "description", "terraform_relevance"}
         for entry in self.interactions:
-            for field in required:
-                self.assertIn(field, entry, f"interaction entry missing '{field}': {entry.get('rule_name', '?')}")
+            missing = required - entry.keys()
+            self.assertFalse(missing, f"interaction entry missing {sorted(missing)}: {entry.get('rule_name', '?')}")
 
     def test_interaction_unique_names(self):
         names = [e["rule_name"] for e in self.interactions]
-        self.assertEqual(len(names), len(set(names)), "Duplicate rule_name in interaction_rules")
+        dups = sorted(k for k, count in Counter(names).items() if count > 1)
+        self.assertFalse(dups, f"Duplicate rule_name in interaction_rules: {dups}")
 
 
 class TestSGInteractions(unittest.TestCase):
@@ -263,9 +266,6 @@ class TestSGInteractions(unittest.TestCase):
         cls.data = load_json(CANON_DIR / "sg-interactions.json")
         cls.patterns = cls.data["patterns"]
 
-    def test_meta_present(self):
-        self.assertIn("_meta", self.data)
-
     def test_minimum_entries(self):
         self.assertGreaterEqual(len(self.patterns), 12, "Need at least 12 SG interaction patterns")
 
@@ -273,13 +273,14 @@ class TestSGInteractions(unittest.TestCase):
         required = {"pattern_name", "description", "symptom", "root_cause",
                      "solution", "terraform_resources", "tags"}
         for pattern in self.patterns:
-            for field in required:
-                self.assertIn(field, pattern,
-                    f"Pattern missing '{field}': {pattern.get('pattern_name', '?')}")
+            missing = required - pattern.keys()
+            self.assertFalse(missing,
+                f"Pattern missing {sorted(missing)}: {pattern.get('pattern_name', '?')}")
 
     def test_unique_pattern_names(self):
         names = [p["pattern_name"] for p in self.patterns]
-        self.assertEqual(len(names), len(set(names)), "Duplicate pattern_name values found")
+        dups = sorted(k for k, count in Counter(names).items() if count > 1)
+        self.assertFalse(dups, f"Duplicate pattern_name values found: {dups}")
 
     def test_solution_non_empty(self):
         for pattern in self.patterns:
@@ -318,10 +319,14 @@ class TestCrossFileConsistency(unittest.TestCase):
         cls.compat = load_json(CANON_DIR / "provider-compat.json")
 
     def test_all_files_have_meta(self):
+        """Every Canon file carries a _meta block with the standard fields."""
+        required = {"source", "version", "date", "description"}
         for name, data in [("errors", self.errors), ("limits", self.limits),
                            ("iam", self.iam), ("sg", self.sg), ("compat", self.compat)]:
-            self.assertIn("_meta", data, f"{name} missing _meta")
-            self.assertIn("version", data["_meta"], f"{name} _meta missing version")
+            with self.subTest(file=name):
+                self.assertIn("_meta", data, f"{name} missing _meta")
+                missing = required - data["_meta"].keys()
+                self.assertFalse(missing, f"{name} _meta missing {sorted(missing)}")
 
     def test_all_files_valid_json(self):
         """Redundant with load, but explicit."""
@@ -333,15 +338,11 @@ class TestCrossFileConsistency(unittest.TestCase):
 
     def test_sg_errors_have_matching_signatures(self):
         """SG interaction symptoms should have corresponding error signatures."""
+        # The check only needs one SG symptom to match, so any() stops at the
+        # first hit instead of matching every remaining symptom.
         sigs = self.errors["signatures"]
-        sg_patterns = self.sg["patterns"]
-        # At least some SG symptoms should match error signatures
-        matched = 0
-        for pattern in sg_patterns:
-            symptom = pattern["symptom"]
-            if match_error(symptom, sigs):
-                matched += 1
-        self.assertGreater(matched, 0,
+        self.assertTrue(
+            any(match_error(pattern["symptom"], sigs) for pattern in self.sg["patterns"]),
             "No SG interaction symptoms match any error signature")
 
 
@@ -9,6 +9,9 @@ All tests use mock plan JSON fixtures and in-memory SQLite.
 """
 from __future__ import annotations
 
+import contextlib
+import functools
+import io
 import json
 import os
 import sqlite3
@@ -16,32 +19,68 @@ import subprocess
 import sys
 import tempfile
 import unittest
+from collections import Counter
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+FORK_MEMORY_SH = str(SCRIPTS_DIR / "fork-memory.sh")
 VPC_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "vpc"
 ECS_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "ecs"
 
 sys.path.insert(0, str(SCRIPTS_DIR))
 
+import canon_search
 from canon_lib import load_canon, match_error, search_by_resource
 from tf_plan_analyzer import analyze, parse_plan, find_canon_matches, check_limit_warnings
 from memory_lib import (
-    connect, init_schema, record_convention, reinforce_convention,
+    batch, connect, init_schema, record_convention, reinforce_convention,
     lookup_conventions, effective_confidence, _should_override_convention,
     record_fix, record_quirk, export_for_fork,
 )
 
 
+@functools.lru_cache(maxsize=None)
+def _load_plan(path: str) -> dict:
+    """Parse a fixture plan once per process; callers treat it as read-only."""
+    return json.loads(Path(path).read_bytes())
+
+
+@functools.lru_cache(maxsize=None)
+def _analyze_plan(path: str) -> dict:
+    """Analyze a fixture plan once per process; callers treat it as read-only."""
+    return analyze(_load_plan(path))
+
+
+def _canon_search(*argv: str) -> dict:
+    """Run canon_search.main in-process and return its parsed JSON output.
+
+    Shares this process's load_canon cache instead of starting an interpreter
+    and re-reading Canon per query.
+    """
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        canon_search.main(list(argv))
+    return json.loads(buf.getvalue())
+
+
 class TestVPCScenario(unittest.TestCase):
     """Scenario 1: VPC + Subnets + NAT — Canon-powered analysis."""
 
+    EXPECTED_RESOURCE_TYPES = frozenset({
+        "aws_vpc", "aws_internet_gateway", "aws_subnet",
+        "aws_eip", "aws_nat_gateway", "aws_security_group",
+    })
+
     @classmethod
     def setUpClass(cls):
-        with open(VPC_FIXTURES / "plan.json") as f:
-            cls.plan_data = json.load(f)
-        cls.analysis = analyze(cls.plan_data)
+        plan_path = str(VPC_FIXTURES / "plan.json")
+        cls.plan_data = _load_plan(plan_path)
+        cls.analysis = _analyze_plan(plan_path)
+        cls.diag_summaries = tuple(d["diagnostic"]["summary"] for d in cls.analysis["diagnostic_matches"])
+        cls.resource_types = frozenset(cls.analysis["plan_summary"]["resource_types"])
+        cls.limit_names = frozenset(w["limit"] for w in cls.analysis["limit_warnings"])
+        cls.findings_by_source = Counter(f["source"] for f in cls.analysis["canon_findings"])
 
     def test_plan_summary_resource_count(self):
         """Plan should contain 16 resources (1 VPC + 1 IGW + 6 subnets + 3 EIPs + 3 NATs + 2 SGs)."""
@@ -50,61 +89,37 @@ class TestVPCScenario(unittest.TestCase):
 
     def test_plan_summary_resource_types(self):
         """Plan should contain the expected resource types."""
-        types = set(self.analysis["plan_summary"]["resource_types"])
-        expected = {
-            "aws_vpc", "aws_internet_gateway", "aws_subnet",
-            "aws_eip", "aws_nat_gateway", "aws_security_group",
-        }
-        self.assertEqual(types, expected)
+        self.assertEqual(self.resource_types, self.EXPECTED_RESOURCE_TYPES)
 
     def test_canon_findings_include_sg_patterns(self):
         """Canon findings should include SG-related entries from sg-interactions.json."""
-        findings = self.analysis["canon_findings"]
-        sg_sources = [f for f in findings if f["source"] == "sg-interactions.json"]
-        self.assertGreater(len(sg_sources), 0, "Expected sg-interactions.json findings")
+        self.assertGreater(self.findings_by_source["sg-interactions.json"], 0,
+                           "Expected sg-interactions.json findings")
 
     def test_diagnostic_matches_cycle(self):
         """Cycle diagnostic in plan should match Canon error signature."""
-        diag_matches = self.analysis["diagnostic_matches"]
-        self.assertGreater(len(diag_matches), 0, "Expected diagnostic matches")
-        summaries = [d["diagnostic"]["summary"] for d in diag_matches]
+        self.assertGreater(len(self.diag_summaries), 0, "Expected diagnostic matches")
         self.assertTrue(
-            any("Cycle" in s for s in summaries),
-            f"Expected Cycle diagnostic match, got: {summaries}",
+            any("Cycle" in s for s in self.diag_summaries),
+            f"Expected Cycle diagnostic match, got: {self.diag_summaries}",
         )
 
     def test_limit_warnings_include_vpc(self):
         """Limit warnings should flag VPCs per region."""
-        limits = self.analysis["limit_warnings"]
-        limit_names = [w["limit"] for w in limits]
-        self.assertIn("VPCs per region", limit_names)
+        self.assertIn("VPCs per region", self.limit_names)
 
     def test_limit_warnings_include_eip(self):
         """Limit warnings should flag Elastic IPs (3 NAT gateways = 3 of 5 EIPs)."""
-        limits = self.analysis["limit_warnings"]
-        limit_names = [w["limit"] for w in limits]
-        self.assertIn("Elastic IPs per region", limit_names)
+        self.assertIn("Elastic IPs per region", self.limit_names)
 
     def test_canon_search_resource_vpc(self):
         """canon_search --resource aws_vpc should return results."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPTS_DIR / "canon_search.py"),
-             "--resource", "aws_vpc"],
-            capture_output=True, text=True, cwd=str(PROJECT_ROOT),
-        )
-        self.assertEqual(result.returncode, 0, result.stderr)
-        output = json.loads(result.stdout)
+        output = _canon_search("--resource", "aws_vpc")
         self.assertGreater(output["count"], 0)
 
     def test_canon_search_error_cycle(self):
         """canon_search --error with SG cycle text should find signature."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPTS_DIR / "canon_search.py"),
-             "--error", "Cycle: aws_security_group.web, aws_security_group.app"],
-            capture_output=True, text=True, cwd=str(PROJECT_ROOT),
-        )
-        self.assertEqual(result.returncode, 0, result.stderr)
-        output = json.loads(result.stdout)
+        output = _canon_search("--error", "Cycle: aws_security_group.web, aws_security_group.app")
         self.assertGreater(output["count"], 0)
 
 
@@ -113,84 +128,77 @@ class TestECSScenario(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        with open(ECS_FIXTURES / "plan.json") as f:
-            cls.plan_data = json.load(f)
-        cls.analysis = analyze(cls.plan_data)
+        plan_path = str(ECS_FIXTURES / "plan.json")
+        cls.plan_data = _load_plan(plan_path)
+        cls.analysis = _analyze_plan(plan_path)
+        cls.diag_summaries = tuple(d["diagnostic"]["summary"] for d in cls.analysis["diagnostic_matches"])
+        cls.diag_summaries_lower = tuple(summary.lower() for summary in cls.diag_summaries)
+        cls.findings_by_trigger = Counter(f["triggered_by"] for f in cls.analysis["canon_findings"])
 
     def test_canon_findings_for_ecs_service(self):
         """Canon findings should include ECS service entries."""
-        findings = self.analysis["canon_findings"]
-        ecs_findings = [f for f in findings if f["triggered_by"] == "aws_ecs_service"]
-        self.assertGreater(len(ecs_findings), 0, "Expected aws_ecs_service Canon findings")
+        self.assertGreater(self.findings_by_trigger["aws_ecs_service"], 0,
+                           "Expected aws_ecs_service Canon findings")
 
     def test_diagnostic_match_steady_state(self):
         """ECS steady state diagnostic should match Canon error signature."""
-        diag_matches = self.analysis["diagnostic_matches"]
-        summaries = [d["diagnostic"]["summary"] for d in diag_matches]
         self.assertTrue(
-            any("steady state" in s.lower() for s in summaries),
-            f"Expected steady state diagnostic match, got: {summaries}",
+            any("steady state" in s for s in self.diag_summaries_lower),
+            f"Expected steady state diagnostic match, got: {self.diag_summaries}",
         )
 
     def test_diagnostic_match_alb_subnets(self):
         """ALB 2-AZ subnet requirement should match Canon error signature."""
-        diag_matches = self.analysis["diagnostic_matches"]
-        summaries = [d["diagnostic"]["summary"] for d in diag_matches]
         self.assertTrue(
-            any("subnets" in s.lower() and "availability zones" in s.lower() for s in summaries),
-            f"Expected ALB subnet diagnostic match, got: {summaries}",
+            any("subnets" in s and "availability zones" in s for s in self.diag_summaries_lower),
+            f"Expected ALB subnet diagnostic match, got: {self.diag_summaries}",
         )
 
     def test_canon_search_ecs_service(self):
         """canon_search --resource aws_ecs_service should return results."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPTS_DIR / "canon_search.py"),
-             "--resource", "aws_ecs_service"],
-            capture_output=True, text=True, cwd=str(PROJECT_ROOT),
-        )
-        self.assertEqual(result.returncode, 0, result.stderr)
-        output = json.loads(result.stdout)
+        output = _canon_search("--resource", "aws_ecs_service")
         self.assertGreater(output["count"], 0)
 
     def test_canon_search_error_health_check(self):
         """Error search with ECS health check text should find signature."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPTS_DIR / "canon_search.py"),
-             "--error", "Error waiting for ECS service to reach a steady state: health check failure"],
-            capture_output=True, text=True, cwd=str(PROJECT_ROOT),
+        output = _canon_search(
+            "--error",
+            "Error waiting for ECS service to reach a steady state: health check failure",
         )
-        self.assertEqual(result.returncode, 0, result.stderr)
-        output = json.loads(result.stdout)
         self.assertGreater(output["count"], 0)
 
     def test_canon_search_error_cluster_not_found(self):
         """Error search with ClusterNotFound text should find signature."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPTS_DIR / "canon_search.py"),
-             "--error", "Error creating ECS service ClusterNotFoundException"],
-            capture_output=True, text=True, cwd=str(PROJECT_ROOT),
-        )
-        self.assertEqual(result.returncode, 0, result.stderr)
-        output = json.loads(result.stdout)
+        output = _canon_search("--error", "Error creating ECS service ClusterNotFoundException")
         self.assertGreater(output["count"], 0)
 
 
 class TestNamingPersistence(unittest.TestCase):
     """Scenario 3: Convention confidence grows across sessions until it overrides Canon."""
 
+    @classmethod
+    def setUpClass(cls):
+        # Build the schema once; each test runs inside a transaction that is
+        # rolled back afterwards, so tests still start from an empty DB
+        cls.conn = sqlite3.connect(":memory:")
+        cls.conn.row_factory = sqlite3.Row
+        init_schema(cls.conn)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+
     def setUp(self):
-        self.conn = sqlite3.connect(":memory:")
-        self.conn.row_factory = sqlite3.Row
-        init_schema(self.conn)
+        # batch() makes the memory_lib writes skip their own commits. The
+        # rollback cleanup is registered after it, so it runs first and the
+        # batch's closing commit has nothing left to commit.
+        self.enterContext(batch(self.conn))
+        self.addCleanup(self.conn.rollback)
         # Pre-insert session rows for FK constraints
-        for sid in ("session-A", "session-B", "session-C"):
-            self.conn.execute(
-                "INSERT OR IGNORE INTO sessions (session_id) VALUES (?)", (sid,)
-            )
-        self.conn.commit()
-
-    def tearDown(self):
-        self.conn.close()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO sessions (session_id) VALUES (?)",
+            [("session-A",), ("session-B",), ("session-C",)],
+        )
 
     def test_session1_record_convention(self):
         """Session 1: record_convention → confidence = 0.5, distinct_sessions = 1."""
@@ -258,94 +266,97 @@ class TestNamingPersistence(unittest.TestCase):
 class TestForkE2E(unittest.TestCase):
     """Scenario 5: Fork with team-scoped Memories via fork-memory.sh."""
 
-    def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.source_db = os.path.join(self.tmpdir, "source.db")
-        self.output_db = os.path.join(self.tmpdir, "fork.db")
-        self._populate_source()
+    @classmethod
+    def setUpClass(cls):
+        # Every test inspects the same fork, so populate and run it once.
+        # The class cleanup removes the directory even if setup fails midway.
+        cls.tmpdir = cls.enterClassContext(tempfile.TemporaryDirectory(prefix="boid_fork_"))
+        cls.source_db = os.path.join(cls.tmpdir, "source.db")
+        cls.output_db = os.path.join(cls.tmpdir, "fork.db")
+        cls._populate_source()
+        cls.fork_result = subprocess.run(
+            [FORK_MEMORY_SH, "--scope", "team", "--output", cls.output_db],
+            capture_output=True, text=True,
+            env={**os.environ, "BOID_MEMORY_DB": cls.source_db},
+            cwd=str(PROJECT_ROOT),
+        )
+        cls.fork_counts = cls._count_fork()
 
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    @classmethod
+    def _count_fork(cls) -> dict[str, int] | None:
+        """Read every row count the tests assert on in one read-only query."""
+        if not os.path.exists(cls.output_db):
+            return None
+        conn = sqlite3.connect(f"file:{cls.output_db}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM fixes WHERE scope = 'personal') AS personal_fixes,
+                    (SELECT COUNT(*) FROM conventions WHERE scope = 'personal') AS personal_conventions,
+                    (SELECT COUNT(*) FROM fixes) AS fixes,
+                    (SELECT COUNT(*) FROM conventions) AS conventions,
+                    (SELECT COUNT(*) FROM quirks) AS quirks
+            """).fetchone()
+        finally:
+            conn.close()
+        return dict(row)
 
-    def _populate_source(self):
+    @classmethod
+    def _populate_source(cls):
         """Create a source DB with mixed-scope entries."""
-        conn = sqlite3.connect(self.source_db)
+        conn = sqlite3.connect(cls.source_db)
         conn.row_factory = sqlite3.Row
+        # Throwaway fixture DB: skip the rollback journal file and fsyncs
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA synchronous=OFF")
         init_schema(conn)
 
-        # Personal entries (should NOT appear in fork)
-        record_fix(conn, "personal error", "cause", "fix",
-                    scope="personal", session_id=None)
-        record_convention(conn, "naming", "personal-pattern",
-                          scope="personal", session_id=None)
-
-        # Team entries (should appear in fork with scope=team)
-        record_fix(conn, "team error", "team cause", "team fix",
-                    scope="team", session_id=None)
-        record_convention(conn, "naming", "team-pattern",
+        # One transaction for all seed rows instead of a commit per record_*
+        with batch(conn):
+            # Personal entries (should NOT appear in fork)
+            record_fix(conn, "personal error", "cause", "fix",
+                        scope="personal", session_id=None)
+            record_convention(conn, "naming", "personal-pattern",
+                              scope="personal", session_id=None)
+
+            # Team entries (should appear in fork with scope=team)
+            record_fix(conn, "team error", "team cause", "team fix",
+                        scope="team", session_id=None)
+            record_convention(conn, "naming", "team-pattern",
+                              scope="team", session_id=None)
+            record_quirk(conn, "ec2", "team quirk",
                           scope="team", session_id=None)
-        record_quirk(conn, "ec2", "team quirk",
-                      scope="team", session_id=None)
 
-        # Org entries (should appear in fork)
-        record_fix(conn, "org error", "org cause", "org fix",
-                    scope="org", session_id=None)
+            # Org entries (should appear in fork)
+            record_fix(conn, "org error", "org cause", "org fix",
+                        scope="org", session_id=None)
 
         conn.close()
 
     def test_fork_script_runs(self):
         """fork-memory.sh should execute successfully."""
-        result = subprocess.run(
-            [str(SCRIPTS_DIR / "fork-memory.sh"),
-             "--scope", "team", "--output", self.output_db],
-            capture_output=True, text=True,
-            env={**os.environ, "BOID_MEMORY_DB": self.source_db},
-            cwd=str(PROJECT_ROOT),
-        )
+        result = self.fork_result
         self.assertEqual(result.returncode, 0, f"fork-memory.sh failed: {result.stderr}")
 
     def test_fork_output_exists(self):
         """Forked database file should be created."""
-        subprocess.run(
-            [str(SCRIPTS_DIR / "fork-memory.sh"),
-             "--scope", "team", "--output", self.output_db],
-            capture_output=True, text=True,
-            env={**os.environ, "BOID_MEMORY_DB": self.source_db},
-            cwd=str(PROJECT_ROOT),
-        )
         self.assertTrue(os.path.exists(self.output_db), "Fork output DB not created")
 
     def test_fork_excludes_personal(self):
         """Forked DB should not contain personal-scoped entries."""
-        subprocess.run(
-            [str(SCRIPTS_DIR / "fork-memory.sh"),
-             "--scope", "team", "--output", self.output_db],
-            capture_output=True, text=True,
-            env={**os.environ, "BOID_MEMORY_DB": self.source_db},
-            cwd=str(PROJECT_ROOT),
-        )
-        conn = sqlite3.connect(self.output_db)
-        fix_count = conn.execute("SELECT COUNT(*) FROM fixes WHERE scope = 'personal'").fetchone()[0]
-        conv_count = conn.execute("SELECT COUNT(*) FROM conventions WHERE scope = 'personal'").fetchone()[0]
-        conn.close()
+        self.assertIsNotNone(self.fork_counts, "Fork output DB not created")
+        fix_count = self.fork_counts["personal_fixes"]
+        conv_count = self.fork_counts["personal_conventions"]
         self.assertEqual(fix_count, 0, "Personal fixes should be excluded")
         self.assertEqual(conv_count, 0, "Personal conventions should be excluded")
 
     def test_fork_includes_team_and_org(self):
         """Forked DB should contain team and org entries with correct counts."""
-        subprocess.run(
-            [str(SCRIPTS_DIR / "fork-memory.sh"),
-             "--scope", "team", "--output", self.output_db],
-            capture_output=True, text=True,
-            env={**os.environ, "BOID_MEMORY_DB": self.source_db},
-            cwd=str(PROJECT_ROOT),
-        )
-        conn = sqlite3.connect(self.output_db)
-        fix_count = conn.execute("SELECT COUNT(*) FROM fixes").fetchone()[0]
-        conv_count = conn.execute("SELECT COUNT(*) FROM conventions").fetchone()[0]
-        quirk_count = conn.execute("SELECT COUNT(*) FROM quirks").fetchone()[0]
-        conn.close()
+        self.assertIsNotNone(self.fork_counts, "Fork output DB not created")
+        fix_count = self.fork_counts["fixes"]
+        conv_count = self.fork_counts["conventions"]
+        quirk_count = self.fork_counts["quirks"]
         # 1 team fix + 1 org fix = 2 fixes
         self.assertEqual(fix_count, 2, "Expected 2 fixes (team + org)")
         # 1 team convention
@@ -5,12 +5,14 @@ Tests cover: schema v2, fix CRUD, convention CRUD, quirk CRUD,
 confidence model, read priority (Canon vs Memories merge),
 fork export, and schema migration.
 """
+import functools
 import os
 import sqlite3
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from typing import Iterable
 
 # Ensure scripts/ is importable
 SCRIPTS_DIR = Path(__file__).resolve().parent.parent.parent / "scripts"
@@ -20,6 +22,18 @@ import memory_lib
 
 SCHEMA_FILE = Path(__file__).resolve().parent.parent.parent / "memory" / "schema.sql"
 MIGRATE_FILE = Path(__file__).resolve().parent.parent.parent / "memory" / "migrate_v1_to_v2.sql"
+INDEXES_FILE = Path(__file__).resolve().parent.parent.parent / "memory" / "indexes.sql"
+# Read once; most tests build a fresh DB from these scripts
+SCHEMA_SQL = SCHEMA_FILE.read_text()
+MIGRATE_SQL = MIGRATE_FILE.read_text()
+INDEXES_SQL = INDEXES_FILE.read_text()
+
+COMPOSITE_INDEXES = (
+    "idx_fixes_resource_scope", "idx_conventions_category_pattern",
+    "idx_conventions_category_scope", "idx_quirks_service_region",
+)
+# Single-column indexes made redundant by the composites above
+REDUNDANT_INDEXES = ("idx_fixes_resource", "idx_conventions_category", "idx_quirks_service")
 
 # V1 schema for migration tests (without session_id columns)
 V1_SCHEMA = """
@@ -95,100 +109,147 @@ INSERT OR IGNORE INTO metadata (key, value) VALUES
 """
 
 
-def _fresh_conn() -> sqlite3.Connection:
-    """Create an in-memory SQLite connection with the v2 schema."""
+@functools.lru_cache(maxsize=None)
+def _template(script: str) -> sqlite3.Connection:
+    """Run a schema script once into an in-memory DB that _clone copies from."""
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(script)
+    return conn
+
+
+def _clone(script: str) -> sqlite3.Connection:
+    """Create an in-memory connection holding a page copy of a schema template.
+
+    The backup API copies pages, so each test skips re-parsing the DDL. Per-
+    connection pragmas are not copied, so foreign keys are re-enabled here.
+    """
     conn = sqlite3.connect(":memory:")
+    _template(script).backup(conn)
     conn.execute("PRAGMA foreign_keys = ON")
     conn.row_factory = sqlite3.Row
-    conn.executescript(SCHEMA_FILE.read_text())
     return conn
 
 
-def _insert_session(conn: sqlite3.Connection, session_id: str) -> None:
-    """Insert a session row (required for FK constraints)."""
-    conn.execute(
+def _index_names(conn: sqlite3.Connection) -> set[str]:
+    """Names of all indexes in the connection's main schema."""
+    return {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    }
+
+
+def _fresh_conn() -> sqlite3.Connection:
+    """Create an in-memory SQLite connection with the v2 schema."""
+    return _clone(SCHEMA_SQL)
+
+
+def _insert_sessions(conn: sqlite3.Connection, session_ids: Iterable[str]) -> None:
+    """Insert session rows (required for FK constraints) with one commit."""
+    conn.executemany(
         "INSERT OR IGNORE INTO sessions (session_id) VALUES (?)",
-        (session_id,),
+        [(session_id,) for session_id in session_ids],
     )
     conn.commit()
 
 
+def _insert_session(conn: sqlite3.Connection, session_id: str) -> None:
+    """Insert a single session row."""
+    _insert_sessions(conn, (session_id,))
+
+
+class _RollbackTestCase(unittest.TestCase):
+    """Share one DB per class; each test's writes are rolled back.
+
+    The memory_lib writers commit on their own, so each test runs inside
+    batch() (which suppresses those commits) and is rolled back on cleanup.
+    """
+
+    SESSIONS: tuple[str, ...] = ()
+
+    @classmethod
+    def setUpClass(cls):
+        cls.conn = _fresh_conn()
+        _insert_sessions(cls.conn, cls.SESSIONS)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+
+    def setUp(self):
+        self.enterContext(memory_lib.batch(self.conn))
+        self.addCleanup(self.conn.rollback)
+
+
 # ── Schema Tests ─────────────────────────────────────────────────────
 
 
 class TestSchemaV2(unittest.TestCase):
     """Test the v2 schema structure."""
 
-    def test_schema_creates_without_error(self):
+    @classmethod
+    def setUpClass(cls):
+        # Introspect the schema once; the tests only check membership
         conn = _fresh_conn()
-        tables = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        ).fetchall()
-        names = [t["name"] for t in tables]
-        self.assertIn("fixes", names)
-        self.assertIn("conventions", names)
-        self.assertIn("quirks", names)
-        self.assertIn("sessions", names)
-        self.assertIn("metadata", names)
+        cls.cols: dict[str, set[str]] = {}
+        for table, col in conn.execute(
+            """SELECT m.name, p.name FROM sqlite_master AS m
+               JOIN pragma_table_info(m.name) AS p WHERE m.type = 'table'"""
+        ):
+            cls.cols.setdefault(table, set()).add(col)
+        cls.indexes = {
+            row["name"]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+        cls.schema_version = conn.execute(
+            "SELECT value FROM metadata WHERE key='schema_version'"
+        ).fetchone()["value"]
         conn.close()
 
+    def test_schema_creates_without_error(self):
+        for table in ("fixes", "conventions", "quirks", "sessions", "metadata"):
+            self.assertIn(table, self.cols)
+
     def test_fixes_has_session_id(self):
-        conn = _fresh_conn()
-        cols = [
-            row["name"]
-            for row in conn.execute("PRAGMA table_info(fixes)").fetchall()
-        ]
-        self.assertIn("session_id", cols)
-        conn.close()
+        self.assertIn("session_id", self.cols["fixes"])
 
     def test_conventions_has_session_id(self):
-        conn = _fresh_conn()
-        cols = [
-            row["name"]
-            for row in conn.execute("PRAGMA table_info(conventions)").fetchall()
-        ]
-        self.assertIn("session_id", cols)
-        conn.close()
+        self.assertIn("session_id", self.cols["conventions"])
 
     def test_conventions_has_distinct_sessions(self):
-        conn = _fresh_conn()
-        cols = [
-            row["name"]
-            for row in conn.execute("PRAGMA table_info(conventions)").fetchall()
-        ]
-        self.assertIn("distinct_sessions", cols)
-        conn.close()
+        self.assertIn("distinct_sessions", self.cols["conventions"])
 
     def test_quirks_has_session_id(self):
-        conn = _fresh_conn()
-        cols = [
-            row["name"]
-            for row in conn.execute("PRAGMA table_info(quirks)").fetchall()
-        ]
-        self.assertIn("session_id", cols)
-        conn.close()
+        self.assertIn("session_id", self.cols["quirks"])
+
+    def test_lookup_indexes_exist(self):
+        for idx in COMPOSITE_INDEXES:
+            self.assertIn(idx, self.indexes)
+        for idx in REDUNDANT_INDEXES:
+            self.assertNotIn(idx, self.indexes)
 
     def test_schema_version_is_2(self):
-        conn = _fresh_conn()
-        ver = conn.execute(
-            "SELECT value FROM metadata WHERE key='schema_version'"
-        ).fetchone()
-        self.assertEqual(ver["value"], "2")
-        conn.close()
+        self.assertEqual(self.schema_version, "2")
+
+
+class TestConnect(unittest.TestCase):
+    """Test connection setup in memory_lib.connect()."""
+
+    def test_file_db_uses_wal_and_busy_timeout(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = memory_lib.connect(os.path.join(tmpdir, "boid.db"))
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+            conn.close()
+        self.assertEqual(mode, "wal")
+        self.assertEqual(timeout, 5000)
 
 
 # ── Fix CRUD Tests ───────────────────────────────────────────────────
 
 
-class TestRecordFix(unittest.TestCase):
+class TestRecordFix(_RollbackTestCase):
     """Test fix recording and lookup."""
 
-    def setUp(self):
-        self.conn = _fresh_conn()
-        _insert_session(self.conn, "sess-001")
-
-    def tearDown(self):
-        self.conn.close()
+    SESSIONS = ("sess-001",)
 
     def test_basic_insert_returns_row_id(self):
         rid = memory_lib.record_fix(
@@ -264,16 +325,10 @@ class TestRecordFix(unittest.TestCase):
 # ── Convention CRUD Tests ────────────────────────────────────────────
 
 
-class TestRecordConvention(unittest.TestCase):
+class TestRecordConvention(_RollbackTestCase):
     """Test convention recording and lookup."""
 
-    def setUp(self):
-        self.conn = _fresh_conn()
-        _insert_session(self.conn, "sess-001")
-        _insert_session(self.conn, "sess-002")
-
-    def tearDown(self):
-        self.conn.close()
+    SESSIONS = ("sess-001", "sess-002")
 
     def test_basic_insert_with_default_confidence(self):
         rid = memory_lib.record_convention(
@@ -367,15 +422,10 @@ class TestRecordConvention(unittest.TestCase):
 # ── Quirk CRUD Tests ────────────────────────────────────────────────
 
 
-class TestRecordQuirk(unittest.TestCase):
+class TestRecordQuirk(_RollbackTestCase):
     """Test quirk recording and lookup."""
 
-    def setUp(self):
-        self.conn = _fresh_conn()
-        _insert_session(self.conn, "sess-001")
-
-    def tearDown(self):
-        self.conn.close()
+    SESSIONS = ("sess-001",)
 
     def test_basic_insert(self):
         rid = memory_lib.record_quirk(
@@ -416,23 +466,53 @@ class TestRecordQuirk(unittest.TestCase):
         self.assertEqual(row["session_id"], "sess-001")
 
 
-# ── Confidence Model Tests ───────────────────────────────────────────
+# ── Batch Write Tests ────────────────────────────────────────────────
 
 
-class TestConfidenceModel(unittest.TestCase):
-    """Test the session-weighted confidence model."""
+class TestBatch(unittest.TestCase):
+    """Test deferred commits via memory_lib.batch()."""
 
     def setUp(self):
         self.conn = _fresh_conn()
         _insert_session(self.conn, "sess-001")
-        _insert_session(self.conn, "sess-002")
-        _insert_session(self.conn, "sess-003")
-        _insert_session(self.conn, "sess-004")
-        _insert_session(self.conn, "sess-005")
 
     def tearDown(self):
         self.conn.close()
 
+    def test_writes_commit_once_on_exit(self):
+        with memory_lib.batch(self.conn):
+            memory_lib.record_fix(self.conn, "Error: a", "rc", "fix")
+            memory_lib.record_convention(self.conn, "naming", "kebab-case")
+            memory_lib.record_quirk(self.conn, "ec2", "quirk")
+            self.assertTrue(self.conn.in_transaction)
+        self.assertFalse(self.conn.in_transaction)
+        self.assertEqual(len(memory_lib.lookup_fix(self.conn)), 1)
+        self.assertEqual(len(memory_lib.lookup_conventions(self.conn)), 1)
+
+    def test_exception_rolls_back_all_writes(self):
+        with self.assertRaises(RuntimeError):
+            with memory_lib.batch(self.conn):
+                memory_lib.record_fix(self.conn, "Error: a", "rc", "fix")
+                memory_lib.record_quirk(self.conn, "ec2", "quirk")
+                raise RuntimeError("abort")
+        self.assertEqual(memory_lib.lookup_fix(self.conn), [])
+        self.assertEqual(memory_lib.lookup_quirks(self.conn), [])
+
+    def test_commits_resume_after_batch(self):
+        with memory_lib.batch(self.conn):
+            memory_lib.record_quirk(self.conn, "ec2", "in batch")
+        memory_lib.record_quirk(self.conn, "rds", "after batch")
+        self.assertFalse(self.conn.in_transaction)
+
+
+# ── Confidence Model Tests ───────────────────────────────────────────
+
+
+class TestConfidenceModel(_RollbackTestCase):
+    """Test the session-weighted confidence model."""
+
+    SESSIONS = tuple(f"sess-{i:03d}" for i in range(1, 6))
+
     def test_reinforce_adds_delta(self):
         rid = memory_lib.record_convention(
             self.conn, "naming", "snake_case", session_id="sess-001",
@@ -448,7 +528,6 @@ class TestConfidenceModel(unittest.TestCase):
         self.conn.execute(
             "UPDATE conventions SET confidence = 0.95 WHERE id = ?", (rid,)
         )
-        self.conn.commit()
         new_conf = memory_lib.reinforce_convention(self.conn, rid)
         self.assertAlmostEqual(new_conf, 1.0)
 
@@ -460,25 +539,6 @@ class TestConfidenceModel(unittest.TestCase):
         new_conf = memory_lib.contradict_convention(self.conn, rid)
         self.assertAlmostEqual(new_conf, 0.3)
 
-    def test_effective_confidence_single_session_ceiling(self):
-        eff = memory_lib.effective_confidence(0.9, 1)
-        self.assertAlmostEqual(eff, 0.7)  # capped
-
-    def test_effective_confidence_3_sessions(self):
-        eff = memory_lib.effective_confidence(0.7, 3)
-        # bonus = (3-1) * 0.05 = 0.1
-        self.assertAlmostEqual(eff, 0.8)
-
-    def test_effective_confidence_5_sessions(self):
-        eff = memory_lib.effective_confidence(0.7, 5)
-        # bonus = min((5-1)*0.05, 0.2) = 0.2
-        self.assertAlmostEqual(eff, 0.9)
-
-    def test_effective_confidence_caps_at_1(self):
-        eff = memory_lib.effective_confidence(0.95, 10)
-        # bonus = 0.2 (capped), 0.95 + 0.2 = 1.15 → capped at 1.0
-        self.assertAlmostEqual(eff, 1.0)
-
     def test_reinforce_from_new_session_bumps_distinct(self):
         rid = memory_lib.record_convention(
             self.conn, "naming", "snake_case", session_id="sess-001",
@@ -527,19 +587,30 @@ class TestConfidenceModel(unittest.TestCase):
         self.assertAlmostEqual(eff, 0.95)
 
 
+class TestEffectiveConfidence(unittest.TestCase):
+    """Test the pure effective_confidence() calculation (no DB needed)."""
+
+    def test_effective_confidence(self):
+        cases = [
+            (0.9, 1, 0.7),    # single-session ceiling
+            (0.7, 3, 0.8),    # bonus = (3-1) * 0.05 = 0.1
+            (0.7, 5, 0.9),    # bonus = min((5-1)*0.05, 0.2) = 0.2
+            (0.95, 10, 1.0),  # bonus capped at 0.2, total capped at 1.0
+        ]
+        for base, sessions, expected in cases:
+            with self.subTest(base=base, sessions=sessions):
+                self.assertAlmostEqual(
+                    memory_lib.effective_confidence(base, sessions), expected
+                )
+
+
 # ── Read Priority Tests ─────────────────────────────────────────────
 
 
-class TestReadPriority(unittest.TestCase):
+class TestReadPriority(_RollbackTestCase):
     """Test Canon vs Memories merge priority logic."""
 
-    def setUp(self):
-        self.conn = _fresh_conn()
-        _insert_session(self.conn, "sess-001")
-        _insert_session(self.conn, "sess-002")
-
-    def tearDown(self):
-        self.conn.close()
+    SESSIONS = ("sess-001", "sess-002")
 
     def test_team_scoped_overrides_canon(self):
         fix = {
@@ -629,6 +700,34 @@ class TestReadPriority(unittest.TestCase):
         self.assertIsNone(reason_p)
 
 
+class TestQueryWithPriority(unittest.TestCase):
+    """Test the combined Canon + Memories query against a file DB."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "boid.db")
+        conn = memory_lib.connect(self.db_path)
+        memory_lib.init_schema(conn)
+        memory_lib.record_fix(
+            conn, "Cycle: aws_security_group.a, aws_security_group.b",
+            "Inline rules", "Use separate rule resources", scope="team",
+        )
+        conn.close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_merged_orders_override_before_canon(self):
+        result = memory_lib.query_with_priority(
+            "Cycle: aws_security_group.a, aws_security_group.b", self.db_path,
+        )
+        self.assertEqual(len(result["memory_results"]), 1)
+        self.assertGreater(len(result["canon_results"]), 0)
+        self.assertEqual(result["merged"][0]["source"], "memory")
+        self.assertTrue(result["merged"][0]["overrides_canon"])
+        self.assertEqual(result["merged"][1]["source"], "canon")
+
+
 # ── Fork Export Tests ────────────────────────────────────────────────
 
 
@@ -636,118 +735,90 @@ class TestForkExport(unittest.TestCase):
     """Test fork export filtering and structure."""
 
     def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self.src_path = os.path.join(self.tmpdir, "source.db")
-        self.dst_path = os.path.join(self.tmpdir, "fork.db")
-
-        # Create source DB with v2 schema
-        src = sqlite3.connect(self.src_path)
-        src.executescript(SCHEMA_FILE.read_text())
+        # Both sides stay in memory; export_for_fork takes open connections
+        self.src = src = _clone(SCHEMA_SQL)
+        self.dst = sqlite3.connect(":memory:")
+        self.dst.row_factory = sqlite3.Row
         src.execute(
             "INSERT INTO sessions (session_id) VALUES ('sess-src')"
         )
 
-        # Insert entries across all scopes
-        src.execute(
+        # Insert entries across all scopes (one implicit transaction)
+        src.executemany(
             """INSERT INTO fixes (error_hash, error_text, root_cause, fix, scope, session_id)
-               VALUES ('h1', 'personal fix', 'rc1', 'f1', 'personal', 'sess-src')"""
-        )
-        src.execute(
-            """INSERT INTO fixes (error_hash, error_text, root_cause, fix, scope, session_id)
-               VALUES ('h2', 'team fix', 'rc2', 'f2', 'team', 'sess-src')"""
-        )
-        src.execute(
-            """INSERT INTO fixes (error_hash, error_text, root_cause, fix, scope, session_id)
-               VALUES ('h3', 'org fix', 'rc3', 'f3', 'org', 'sess-src')"""
-        )
-        src.execute(
+               VALUES (?, ?, ?, ?, ?, 'sess-src')""",
+            [
+                ("h1", "personal fix", "rc1", "f1", "personal"),
+                ("h2", "team fix", "rc2", "f2", "team"),
+                ("h3", "org fix", "rc3", "f3", "org"),
+            ],
+        )
+        src.executemany(
             """INSERT INTO conventions (category, pattern, scope, confidence, session_id, distinct_sessions)
-               VALUES ('naming', 'personal conv', 'personal', 0.8, 'sess-src', 3)"""
+               VALUES ('naming', ?, ?, ?, 'sess-src', ?)""",
+            [
+                ("personal conv", "personal", 0.8, 3),
+                ("team conv", "team", 0.9, 5),
+            ],
         )
-        src.execute(
-            """INSERT INTO conventions (category, pattern, scope, confidence, session_id, distinct_sessions)
-               VALUES ('naming', 'team conv', 'team', 0.9, 'sess-src', 5)"""
-        )
-        src.execute(
+        src.executemany(
             """INSERT INTO quirks (service, description, scope, session_id)
-               VALUES ('ec2', 'personal quirk', 'personal', 'sess-src')"""
-        )
-        src.execute(
-            """INSERT INTO quirks (service, description, scope, session_id)
-               VALUES ('rds', 'org quirk', 'org', 'sess-src')"""
+               VALUES (?, ?, ?, 'sess-src')""",
+            [
+                ("ec2", "personal quirk", "personal"),
+                ("rds", "org quirk", "org"),
+            ],
         )
         src.commit()
-        src.close()
 
     def tearDown(self):
-        import shutil
-        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        self.src.close()
+        self.dst.close()
 
     def test_fork_team_includes_team_and_org(self):
-        memory_lib.export_for_fork(self.src_path, self.dst_path, "team")
-        dst = sqlite3.connect(self.dst_path)
-        fixes = dst.execute("SELECT * FROM fixes").fetchall()
-        self.assertEqual(len(fixes), 2)  # team + org
-        dst.close()
+        memory_lib.export_for_fork(self.src, self.dst, "team")
+        count = self.dst.execute("SELECT COUNT(*) FROM fixes").fetchone()[0]
+        self.assertEqual(count, 2)  # team + org
 
     def test_fork_org_includes_only_org(self):
-        memory_lib.export_for_fork(self.src_path, self.dst_path, "org")
-        dst = sqlite3.connect(self.dst_path)
-        fixes = dst.execute("SELECT * FROM fixes").fetchall()
-        self.assertEqual(len(fixes), 1)  # org only
-        dst.close()
+        memory_lib.export_for_fork(self.src, self.dst, "org")
+        count = self.dst.execute("SELECT COUNT(*) FROM fixes").fetchone()[0]
+        self.assertEqual(count, 1)  # org only
 
     def test_fork_excludes_personal(self):
-        memory_lib.export_for_fork(self.src_path, self.dst_path, "team")
-        dst = sqlite3.connect(self.dst_path)
-        dst.row_factory = sqlite3.Row
-        all_fixes = dst.execute("SELECT scope FROM fixes").fetchall()
-        scopes = [r["scope"] for r in all_fixes]
-        self.assertNotIn("personal", scopes)
-
-        all_convs = dst.execute("SELECT scope FROM conventions").fetchall()
-        conv_scopes = [r["scope"] for r in all_convs]
-        self.assertNotIn("personal", conv_scopes)
-
-        all_quirks = dst.execute("SELECT scope FROM quirks").fetchall()
-        quirk_scopes = [r["scope"] for r in all_quirks]
-        self.assertNotIn("personal", quirk_scopes)
-        dst.close()
+        memory_lib.export_for_fork(self.src, self.dst, "team")
+        for table in ("fixes", "conventions", "quirks"):
+            has_personal = self.dst.execute(
+                f"SELECT EXISTS(SELECT 1 FROM {table} WHERE scope = 'personal')"
+            ).fetchone()[0]
+            self.assertFalse(has_personal, f"personal rows forked into {table}")
 
     def test_fork_does_not_copy_sessions(self):
-        memory_lib.export_for_fork(self.src_path, self.dst_path, "team")
-        dst = sqlite3.connect(self.dst_path)
-        sessions = dst.execute(
-            "SELECT * FROM sessions"
-        ).fetchall()
-        self.assertEqual(len(sessions), 0)
-        dst.close()
+        memory_lib.export_for_fork(self.src, self.dst, "team")
+        count = self.dst.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        self.assertEqual(count, 0)
 
     def test_forked_db_has_v2_schema(self):
-        memory_lib.export_for_fork(self.src_path, self.dst_path, "team")
-        dst = sqlite3.connect(self.dst_path)
-        dst.row_factory = sqlite3.Row
-        ver = dst.execute(
+        memory_lib.export_for_fork(self.src, self.dst, "team")
+        ver = self.dst.execute(
             "SELECT value FROM metadata WHERE key='schema_version'"
         ).fetchone()
         self.assertEqual(ver["value"], "2")
 
         cols = [
-            r["name"] for r in dst.execute("PRAGMA table_info(conventions)").fetchall()
+            r["name"] for r in self.dst.execute("PRAGMA table_info(conventions)").fetchall()
         ]
         self.assertIn("distinct_sessions", cols)
         self.assertIn("session_id", cols)
-        dst.close()
 
     def test_forked_conventions_reset_distinct_sessions(self):
-        memory_lib.export_for_fork(self.src_path, self.dst_path, "team")
-        dst = sqlite3.connect(self.dst_path)
-        dst.row_factory = sqlite3.Row
-        convs = dst.execute("SELECT * FROM conventions").fetchall()
+        memory_lib.export_for_fork(self.src, self.dst, "team")
+        convs = self.dst.execute(
+            "SELECT distinct_sessions, session_id FROM conventions"
+        )
         for c in convs:
             self.assertEqual(c["distinct_sessions"], 1)
             self.assertIsNone(c["session_id"])
-        dst.close()
 
 
 # ── Migration Tests ──────────────────────────────────────────────────
@@ -757,28 +828,25 @@ class TestMigration(unittest.TestCase):
     """Test schema migration from v1 to v2."""
 
     def test_v1_migrated_has_session_id_columns(self):
-        conn = sqlite3.connect(":memory:")
-        conn.executescript(V1_SCHEMA)
-        conn.executescript(MIGRATE_FILE.read_text())
-
+        conn = _clone(V1_SCHEMA)
+        conn.executescript(MIGRATE_SQL)
+
+        cols = {
+            tuple(row)
+            for row in conn.execute(
+                """SELECT m.name, p.name FROM sqlite_master AS m
+                   JOIN pragma_table_info(m.name) AS p WHERE m.type = 'table'"""
+            )
+        }
         for table in ("fixes", "conventions", "quirks"):
-            cols = [
-                row[1]
-                for row in conn.execute(f"PRAGMA table_info({table})").fetchall()
-            ]
-            self.assertIn("session_id", cols, f"{table} missing session_id")
+            self.assertIn((table, "session_id"), cols, f"{table} missing session_id")
 
         # conventions should also have distinct_sessions
-        conv_cols = [
-            row[1]
-            for row in conn.execute("PRAGMA table_info(conventions)").fetchall()
-        ]
-        self.assertIn("distinct_sessions", conv_cols)
+        self.assertIn(("conventions", "distinct_sessions"), cols)
         conn.close()
 
     def test_v1_data_preserved_after_migration(self):
-        conn = sqlite3.connect(":memory:")
-        conn.executescript(V1_SCHEMA)
+        conn = _clone(V1_SCHEMA)
 
         # Insert v1 data
         conn.execute(
@@ -795,7 +863,7 @@ class TestMigration(unittest.TestCase):
         conn.commit()
 
         # Migrate
-        conn.executescript(MIGRATE_FILE.read_text())
+        conn.executescript(MIGRATE_SQL)
 
         # Verify data still there
         fix = conn.execute("SELECT * FROM fixes WHERE error_hash='hash1'").fetchone()
@@ -807,17 +875,39 @@ class TestMigration(unittest.TestCase):
         self.assertIsNotNone(conv)
         conn.close()
 
+    def test_migration_replaces_redundant_indexes(self):
+        conn = _clone(V1_SCHEMA)
+        conn.executescript(MIGRATE_SQL)
+        names = _index_names(conn)
+        conn.close()
+        self.assertTrue(names.issuperset(COMPOSITE_INDEXES))
+        self.assertTrue(names.isdisjoint(REDUNDANT_INDEXES))
+
+    def test_indexes_sql_upgrades_existing_v2_db(self):
+        # A v2 DB created before the composite indexes were added
+        conn = _fresh_conn()
+        conn.executescript(
+            "".join(f"DROP INDEX {idx};" for idx in COMPOSITE_INDEXES)
+            + "CREATE INDEX idx_fixes_resource ON fixes(resource);"
+            + "CREATE INDEX idx_conventions_category ON conventions(category);"
+            + "CREATE INDEX idx_quirks_service ON quirks(service);"
+        )
+        conn.executescript(INDEXES_SQL)
+        conn.executescript(INDEXES_SQL)  # idempotent
+        names = _index_names(conn)
+        conn.close()
+        self.assertTrue(names.issuperset(COMPOSITE_INDEXES))
+        self.assertTrue(names.isdisjoint(REDUNDANT_INDEXES))
+
     def test_schema_version_updated_to_2(self):
-        conn = sqlite3.connect(":memory:")
-        conn.executescript(V1_SCHEMA)
-        conn.row_factory = sqlite3.Row
+        conn = _clone(V1_SCHEMA)
 
         ver_before = conn.execute(
             "SELECT value FROM metadata WHERE key='schema_version'"
         ).fetchone()
         self.assertEqual(ver_before["value"], "1")
 
-        conn.executescript(MIGRATE_FILE.read_text())
+        conn.executescript(MIGRATE_SQL)
 
         ver_after = conn.execute(
             "SELECT value FROM metadata WHERE key='schema_version'"